@@ -342,5 +342,110 @@ def _(connected_components, disconnected_matrix, matrix, np):
     return
 
 
+@app.cell
+def _(disconnected_matrix, matrix, np):
+    # The versions above are written to be read. They store all N*N matrix entries
+    # and recurse once per node, so a path of a few thousand nodes already exceeds
+    # Python's recursion limit. Here the graph is an edge list, stored as CSR
+    # ("compressed sparse row": the neighbors of node i are
+    # indices[indptr[i]:indptr[i+1]]), and every loop is an explicit stack, so the
+    # cost is O(N + E) in time and memory.
+
+    def to_csr(edges, n):
+        """Edge list -> (indptr, indices) for an undirected graph with n nodes"""
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        src = np.concatenate([edges[:, 0], edges[:, 1]])  # each edge in both directions
+        dst = np.concatenate([edges[:, 1], edges[:, 0]])
+        order = np.argsort(src, kind="stable")
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+        return indptr, dst[order]
+
+    def component_labels(indptr, indices):
+        """
+        Label connected components with an iterative depth-first search.
+
+        Returns:
+            Array where labels[v] is the component of node v; components are numbered
+            0, 1, 2, ... in order of their smallest node
+        """
+        n = len(indptr) - 1
+        ptr, nbr = indptr.tolist(), indices.tolist()
+        labels = [-1] * n
+        count = 0
+        for start in range(n):
+            if labels[start] != -1:
+                continue
+            labels[start] = count
+            stack = [start]
+            while stack:
+                node = stack.pop()
+                for neighbor in nbr[ptr[node]:ptr[node + 1]]:
+                    if labels[neighbor] == -1:
+                        labels[neighbor] = count
+                        stack.append(neighbor)
+            count += 1
+        return np.array(labels)
+
+    def component_labels_streamed(edge_stream, n):
+        """
+        Same labels, from edges that arrive one at a time (a file, a generator) and
+        are never stored: a union-find keeps one parent pointer per node.
+        """
+        parent = list(range(n))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]  # path halving keeps the trees flat
+                x = parent[x]
+            return x
+
+        for u, v in edge_stream:
+            ru, rv = find(u), find(v)
+            if ru != rv:
+                parent[max(ru, rv)] = min(ru, rv)  # the smaller node stays the root
+
+        # Renumber the roots 0, 1, 2, ... in order of their smallest node
+        roots = np.array([find(v) for v in range(n)])
+        return np.unique(roots, return_inverse=True)[1]
+
+    def has_euler_path_fast(edges, n):
+        """
+        Euler path checker in O(N + E): every node with an edge lies in one component,
+        and 0 or 2 nodes have odd degree.
+        """
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        degrees = np.bincount(edges.ravel(), minlength=n)
+        non_isolated_nodes = np.flatnonzero(degrees > 0)
+        if len(non_isolated_nodes) == 0:
+            return True  # Empty graph has Euler path trivially
+
+        labels = component_labels(*to_csr(edges, n))
+        if np.any(labels[non_isolated_nodes] != labels[non_isolated_nodes[0]]):
+            return False  # Graph is disconnected
+
+        odd_degree_count = np.sum(degrees % 2)
+        return odd_degree_count == 0 or odd_degree_count == 2
+
+    # Same answers as before on the small graphs...
+    for _name, _m in (("connected", matrix), ("disconnected", disconnected_matrix)):
+        _edges = np.argwhere(np.triu(_m) > 0)
+        print(f"{_name}: labels {component_labels(*to_csr(_edges, len(_m)))}, "
+              f"Euler path: {has_euler_path_fast(_edges, len(_m))}")
+
+    # ...and on a million-node path, which the recursive version cannot finish
+    _n = 1_000_000
+    path_edges = np.column_stack([np.arange(_n - 1), np.arange(1, _n)])
+    print("Million-node path, components:", component_labels(*to_csr(path_edges, _n)).max() + 1)
+    print("Million-node path, streamed:", component_labels_streamed(map(tuple, path_edges.tolist()), _n).max() + 1)
+    print("Million-node path has Euler path:", has_euler_path_fast(path_edges, _n))
+    return (
+        component_labels,
+        component_labels_streamed,
+        has_euler_path_fast,
+        to_csr,
+    )
+
+
 if __name__ == "__main__":
     app.run()
@@ -148,7 +148,77 @@ def _(csr_matrix, np):
     # Test with our CSR matrix
     test_walk = [0, 1, 2, 4, 3, 1]
     print(f"Walk {test_walk} is valid: {is_walk_sparse(test_walk, csr_matrix)}")
-    return
+    return (is_walk_sparse,)
+
+
+@app.cell
+def _(csr_matrix, is_walk_sparse, np, sparse):
+    def validate_sequences(nodes, offsets, adjacency):
+        """
+        Check a whole batch of node sequences at once: walk, trail and path.
+
+        Args:
+            nodes: every sequence concatenated into one int array
+            offsets: sequence i is nodes[offsets[i]:offsets[i + 1]]
+            adjacency: sparse matrix of an undirected graph
+
+        Returns:
+            dict of boolean arrays, one entry per sequence: "walk", "trail", "path"
+        """
+        nodes = np.asarray(nodes, dtype=np.int64)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        n_seq = len(offsets) - 1
+        seq_of = np.repeat(np.arange(n_seq), np.diff(offsets))  # sequence of each entry
+
+        # Consecutive pairs that belong to the same sequence
+        same = seq_of[:-1] == seq_of[1:]
+        u, v, pair_seq = nodes[:-1][same], nodes[1:][same], seq_of[:-1][same]
+
+        # Edge lookup: in CSR with sorted indices, row * n + column of the stored
+        # entries is one sorted array, so every pair is found by one searchsorted.
+        # An undirected edge is looked up as (smaller, larger), so both directions
+        # land on the same stored entry -- its position is the edge's id.
+        A = sparse.csr_matrix(adjacency)
+        A.eliminate_zeros()
+        A.sort_indices()
+        n, nnz = A.shape[0], A.nnz
+        keys = np.repeat(np.arange(n), np.diff(A.indptr)) * n + A.indices
+        wanted = np.minimum(u, v) * n + np.maximum(u, v)
+        edge_id = np.searchsorted(keys, wanted)
+        found = keys[np.minimum(edge_id, nnz - 1)] == wanted if nnz else np.zeros(len(wanted), bool)
+
+        def repeats(seq, item, n_items):
+            """Sequences in which the same item appears twice: one sort of seq * n_items + item"""
+            key = np.sort(seq * n_items + item)
+            dup = key[1:] == key[:-1]
+            return np.bincount(key[1:][dup] // n_items, minlength=n_seq) > 0
+
+        walk = np.bincount(pair_seq[~found], minlength=n_seq) == 0
+        trail = walk & ~repeats(pair_seq, edge_id, nnz + 1)
+        path = walk & ~repeats(seq_of, nodes, n)
+        return {"walk": walk, "trail": trail, "path": path}
+
+    # The examples from the coding notebook, as one batch
+    _batch = [[0, 1, 2, 4, 3, 1], [0, 3], [0, 1, 3, 4, 2], [0, 1, 2, 1, 3], [0, 1, 3, 4]]
+    _result = validate_sequences(np.concatenate(_batch), np.cumsum([0] + [len(b) for b in _batch]), csr_matrix)
+    for _i, _seq in enumerate(_batch):
+        print(_seq, {k: bool(v[_i]) for k, v in _result.items()})
+
+    # Twenty thousand random candidate tours on a small, dense graph, checked in one call
+    _rng = np.random.default_rng(0)
+    _upper = np.triu(_rng.random((8, 8)) < 0.6, 1)
+    _graph = sparse.csr_matrix((_upper | _upper.T).astype(int))
+    _lengths = _rng.integers(2, 9, size=20_000)
+    _offsets = np.concatenate([[0], np.cumsum(_lengths)])
+    _nodes = _rng.integers(0, 8, size=_offsets[-1])
+    _result = validate_sequences(_nodes, _offsets, _graph)
+    print(f"{len(_lengths)} sequences: {_result['walk'].sum()} walks, "
+          f"{_result['trail'].sum()} trails, {_result['path'].sum()} paths")
+
+    # Same answer as checking them one at a time
+    assert all(_result["walk"][_i] == is_walk_sparse(_nodes[_offsets[_i]:_offsets[_i + 1]], _graph)
+               for _i in range(200))
+    return (validate_sequences,)
 
 
 @app.cell
@@ -69,34 +69,116 @@ def _():
 
 
 @app.cell
-def _(g, network_connectivity, np):
+def _(np):
+    import heapq
+
+    def attack_curve(graph, order):
+        """Connectivity after removing order[:i+1], for every i, in one backward pass.
+
+        Deleting nodes one at a time and recounting components costs O(N) per step.
+        Instead, start from the network with every node in `order` removed and add
+        them back last-first: each returning node merges the components of its present
+        neighbours (union-find, smaller tree under larger), and the largest component
+        only ever grows. Every node and edge is touched once.
+        """
+        n = graph.vcount()
+        neighbors = graph.get_adjlist()
+        parent, size = list(range(n)), [1] * n
+        present = [True] * n
+        for v in order:
+            present[v] = False
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]  # path halving
+                x = parent[x]
+            return x
+
+        def add_back(v):
+            present[v] = True
+            root = find(v)
+            for u in neighbors[v]:
+                if present[u]:
+                    other = find(u)
+                    if other != root:
+                        if size[other] > size[root]:
+                            root, other = other, root
+                        parent[other] = root
+                        size[root] += size[other]
+            return size[root]
+
+        largest = 0
+        for v in range(n):
+            if present[v]:
+                largest = max(largest, add_back(v))
+        curve = np.zeros(len(order))
+        for i in range(len(order) - 1, -1, -1):
+            curve[i] = largest / n
+            largest = max(largest, add_back(order[i]))
+        return curve
+
+    def degree_attack_order(graph):
+        """Removal order of the adaptive degree attack: always the node with the highest
+        *current* degree, lowest index on ties. A heap with lazy updates replaces the
+        argmax over all remaining nodes after every deletion."""
+        degree = graph.degree()
+        neighbors = graph.get_adjlist()
+        removed = [False] * graph.vcount()
+        heap = [(-d, v) for v, d in enumerate(degree)]
+        heapq.heapify(heap)
+        order = []
+        while heap:
+            d, v = heapq.heappop(heap)
+            if removed[v] or -d != degree[v]:
+                continue  # stale entry: v is gone or has lost edges since
+            removed[v] = True
+            order.append(v)
+            for u in neighbors[v]:
+                if not removed[u]:
+                    degree[u] -= 1
+                    heapq.heappush(heap, (-degree[u], u))
+        return np.array(order)
+
+    return attack_curve, degree_attack_order
+
+
+@app.cell
+def _(attack_curve, g, np):
     import pandas as pd
 
     def simulate_random_attack(graph):
         """Simulate random node removal and measure connectivity"""
-        g_test = graph.copy()
-        original_size = g_test.vcount()
-        results = []
-
-        for i in range(original_size - 1):  # Remove all but one node
-            # Randomly select and remove a node
-            node_idx = np.random.choice(g_test.vs.indices)
-            g_test.delete_vertices(node_idx)
-
-            # Measure connectivity
-            connectivity = network_connectivity(g_test, original_size)
-
-            # Store results
-            results.append({
-                "connectivity": connectivity,
-                "frac_nodes_removed": (i + 1) / original_size,
-            })
-
-        return pd.DataFrame(results)
+        original_size = graph.vcount()
+        order = np.random.permutation(original_size)
+
+        # Remove all but one node
+        connectivity = attack_curve(graph, order)[:-1]
+        return pd.DataFrame({
+            "connectivity": connectivity,
+            "frac_nodes_removed": np.arange(1, original_size) / original_size,
+        })
+
+    def simulate_random_attack_ensemble(graph, n_runs=100):
+        """Average the random attack over n_runs independent removal orders"""
+        original_size = graph.vcount()
+        runs = np.array([
+            attack_curve(graph, np.random.permutation(original_size))[:-1]
+            for _ in range(n_runs)
+        ])
+        return pd.DataFrame({
+            "connectivity": runs.mean(axis=0),
+            "connectivity_std": runs.std(axis=0),
+            "frac_nodes_removed": np.arange(1, original_size) / original_size,
+        })
 
     # Run the simulation
     df_random = simulate_random_attack(g)
-    return df_random, pd, simulate_random_attack
+    return (
+        df_random,
+        pd,
+        simulate_random_attack,
+        simulate_random_attack_ensemble,
+    )
 
 
 @app.cell
@@ -118,31 +200,20 @@ def _(df_random):
 
 
 @app.cell
-def _(g, network_connectivity, np, pd):
+def _(attack_curve, degree_attack_order, g, np, pd):
     def simulate_targeted_attack(graph, criterion="degree"):
         """Simulate targeted node removal based on specified criterion"""
-        g_test = graph.copy()
-        original_size = g_test.vcount()
-        results = []
+        original_size = graph.vcount()
 
-        for i in range(original_size - 1):
-            # Remove node with highest degree
-            if criterion == "degree":
-                degrees = g_test.degree()
-                node_idx = g_test.vs.indices[np.argmax(degrees)]
+        # Remove node with highest degree, recomputing degrees after every removal
+        if criterion == "degree":
+            order = degree_attack_order(graph)
 
-            g_test.delete_vertices(node_idx)
-
-            # Measure connectivity
-            connectivity = network_connectivity(g_test, original_size)
-
-            # Store results
-            results.append({
-                "connectivity": connectivity,
-                "frac_nodes_removed": (i + 1) / original_size,
-            })
-
-        return pd.DataFrame(results)
+        connectivity = attack_curve(graph, order)[:-1]
+        return pd.DataFrame({
+            "connectivity": connectivity,
+            "frac_nodes_removed": np.arange(1, original_size) / original_size,
+        })
 
     # Run targeted attack simulation
     df_targeted = simulate_targeted_attack(g)
@@ -193,43 +264,149 @@ def _(g_weighted, igraph):
 
 
 @app.cell
-def _(igraph, network_connectivity, np, pd):
-    def percolation_simulation(lattice_size=100, p_values=None):
-        """Simulate percolation on a 2D lattice"""
+def _(np, pd):
+    import multiprocessing
+    import os
+
+    def newman_ziff(lattice_size, seed):
+        """Occupy the sites of an L x L lattice one at a time, in random order.
+
+        Newman & Ziff (2001): instead of drawing a fresh lattice for every p, add sites
+        one by one and merge clusters with a union-find, recording after the n-th
+        site the largest cluster, the mean size of the other clusters, and whether some
+        cluster joins the top row to the bottom row. One pass gives every n = 0..N.
+        """
+        L = lattice_size
+        N = L * L
+        order = np.random.default_rng(seed).permutation(N).tolist()
+        parent, size = list(range(N)), [1] * N
+        edge = [0] * N  # bit 1: touches the top row, bit 2: touches the bottom row
+        occupied = [False] * N
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        giant = np.zeros(N + 1)
+        mean_size = np.zeros(N + 1)
+        spanning = np.zeros(N + 1)
+        largest, sum_sq, span_at = 0, 0, N + 1
+        for n, v in enumerate(order, start=1):
+            occupied[v] = True
+            row, col = divmod(v, L)
+            edge[v] = (row == 0) | ((row == L - 1) << 1)
+            sum_sq += 1
+            root = v
+            for u, ok in ((v - L, row > 0), (v + L, row < L - 1),
+                          (v - 1, col > 0), (v + 1, col < L - 1)):
+                if ok and occupied[u]:
+                    other = find(u)
+                    if other != root:
+                        if size[other] > size[root]:
+                            root, other = other, root
+                        parent[other] = root
+                        sum_sq += 2 * size[root] * size[other]
+                        size[root] += size[other]
+                        edge[root] |= edge[other]
+            largest = max(largest, size[root])
+            if edge[root] == 3:
+                span_at = min(span_at, n)
+            giant[n] = largest / N
+            if n > largest:
+                mean_size[n] = (sum_sq - largest**2) / (n - largest)
+        spanning[span_at:] = 1.0
+        return giant, mean_size, spanning
+
+    def binomial_weights(N, p):
+        """P(n of N sites occupied) when each is occupied with probability p."""
+        w = np.zeros(N + 1)
+        if p <= 0 or p >= 1:
+            w[0 if p <= 0 else N] = 1.0
+            return w
+        n = np.arange(N)
+        log_w = N * np.log1p(-p) + np.concatenate(
+            [[0.0], np.cumsum(np.log((N - n) / (n + 1)) + np.log(p / (1 - p)))])
+        w = np.exp(log_w - log_w.max())
+        return w / w.sum()
+
+    def _sum_runs(lattice_size, seeds):
+        totals = [np.zeros(lattice_size**2 + 1) for _ in range(3)]
+        for seed in seeds:
+            for total, curve in zip(totals, newman_ziff(lattice_size, seed)):
+                total += curve
+        return totals
+
+    def _sum_runs_in_pool(lattice_size, seeds, n_workers):
+        """Split the realizations over forked workers (fork, because functions defined
+        in a notebook cell cannot be pickled for a spawned one)."""
+        if n_workers <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+            return _sum_runs(lattice_size, seeds)
+        ctx = multiprocessing.get_context("fork")
+        jobs = []
+        for chunk in np.array_split(seeds, n_workers):
+            recv, send = ctx.Pipe(duplex=False)
+            worker = ctx.Process(target=lambda c=chunk, s=send: s.send(_sum_runs(lattice_size, c)))
+            worker.start()
+            send.close()  # only the worker holds the write end, so its death is EOF here
+            jobs.append((worker, recv))
+        totals = [np.zeros(lattice_size**2 + 1) for _ in range(3)]
+        for worker, recv in jobs:
+            try:
+                parts = recv.recv()
+            except EOFError:
+                parts = None
+            worker.join()
+            if parts is None or worker.exitcode != 0:
+                for other, _ in jobs:
+                    other.terminate()
+                raise RuntimeError(f"percolation worker exited with code {worker.exitcode}")
+            for total, part in zip(totals, parts):
+                total += part
+        return totals
+
+    def percolation_simulation(lattice_size=100, p_values=None, n_runs=50, n_workers=None, seed=0):
+        """Site percolation on a 2D lattice, averaged over n_runs Newman-Ziff sweeps"""
         if p_values is None:
-            p_values = np.linspace(0, 1, 20)
+            p_values = np.linspace(0, 1, 101)
+        if n_workers is None:
+            n_workers = min(n_runs, os.cpu_count() or 1)
 
-        # Create 2D lattice
-        g_lattice = igraph.Graph.Lattice([lattice_size, lattice_size],
-                                        nei=1, directed=False,
-                                        mutual=False, circular=False)
+        N = lattice_size**2
+        seeds = np.random.SeedSequence(seed).generate_state(n_runs)
+        giant, mean_size, spanning = (
+            total / n_runs for total in _sum_runs_in_pool(lattice_size, seeds, n_workers))
 
+        # From "exactly n sites occupied" to "each site occupied with probability p"
         results = []
         for p in p_values:
-            # Randomly keep nodes with probability p
-            keep_nodes = np.where(np.random.rand(g_lattice.vcount()) < p)[0]
-
-            if len(keep_nodes) > 0:
-                g_sub = g_lattice.subgraph(keep_nodes)
-                largest_size = network_connectivity(g_sub, g_lattice.vcount())
-            else:
-                largest_size = 0
-
-            results.append({"p": p, "largest_component_fraction": largest_size})
-
+            w = binomial_weights(N, p)
+            results.append({
+                "p": p,
+                "largest_component_fraction": w @ giant,
+                "mean_cluster_size": w @ mean_size,
+                "spanning_probability": w @ spanning,
+            })
         return pd.DataFrame(results)
 
     # Run percolation simulation
-    df_percolation = percolation_simulation(lattice_size=50)
-    return (df_percolation,)
+    df_percolation = percolation_simulation(lattice_size=100)
+
+    # Measure the critical point: where a spanning cluster appears half the time
+    _p, _span = df_percolation["p"], df_percolation["spanning_probability"]
+    p_c_measured = float(np.interp(0.5, _span, _p))
+    print(f"Measured p_c = {p_c_measured:.3f}")
+    return df_percolation, p_c_measured
 
 
 @app.cell
-def _(df_percolation, plt, sns):
+def _(df_percolation, p_c_measured, plt, sns):
     _fig, _ax = plt.subplots(figsize=(6, 5))
     _ax.plot(df_percolation['p'], df_percolation['largest_component_fraction'], 'o-', linewidth=2, markersize=4)
     critical_p = 0.593
     _ax.axvline(x=critical_p, color='red', linestyle='--', alpha=0.7, label=f'Critical point (p_c ≈ {critical_p})')
+    _ax.axvline(x=p_c_measured, color='gray', linestyle=':', alpha=0.7, label=f'Measured (p_c = {p_c_measured:.3f})')
     _ax.set_xlabel('Probability (p)')
     _ax.set_ylabel('Fractional largest component size')
     # Mark theoretical critical point for 2D lattice
@@ -284,14 +461,15 @@ def _(g_airports, np):
 
 
 @app.cell
-def _(f_c, g_airports, np, plt, simulate_random_attack, sns):
-    # Simulate and visualize (using subset for efficiency)
-    n_samples = min(500, g_airports.vcount() - 1)  # Sample for computational efficiency
-    sample_indices = np.linspace(0, g_airports.vcount() - 2, n_samples, dtype=int)
-    df_airport_robustness = simulate_random_attack(g_airports)
-    df_airport_sample = df_airport_robustness.iloc[sample_indices]
+def _(f_c, g_airports, plt, simulate_random_attack_ensemble, sns):
+    # Every point of the curve, averaged over 20 random removal orders
+    df_airport_robustness = simulate_random_attack_ensemble(g_airports, n_runs=20)
     _fig, _ax = plt.subplots(figsize=(6, 5))
-    _ax.plot(df_airport_sample['frac_nodes_removed'], df_airport_sample['connectivity'], 'o-', linewidth=2, markersize=3, alpha=0.8)
+    _ax.plot(df_airport_robustness['frac_nodes_removed'], df_airport_robustness['connectivity'], '-', linewidth=2, alpha=0.8)
+    _ax.fill_between(df_airport_robustness['frac_nodes_removed'],
+                     df_airport_robustness['connectivity'] - df_airport_robustness['connectivity_std'],
+                     df_airport_robustness['connectivity'] + df_airport_robustness['connectivity_std'],
+                     alpha=0.3)
     _ax.axvline(x=f_c, color='red', linestyle='--', alpha=0.7, label=f'Theoretical f_c = {f_c:.3f}')
     _ax.plot([0, 1], [1, 0], 'gray', linestyle=':', alpha=0.5, label='Linear decline')
     _ax.set_xlabel('Proportion of nodes removed')
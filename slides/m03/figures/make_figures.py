@@ -21,6 +21,8 @@ table in review/DECK_SPEC.md.  Nothing is typed in twice.
     python3 figures/make_figures.py kruskal    # only figures whose name contains "kruskal"
 """
 
+import collections
+import heapq
 import itertools
 import json
 import math
@@ -300,17 +302,55 @@ def fill_poly(pts, color="accenttwo", opacity=0.25):
         color, opacity, " -- ".join("(%.1f,%.1f)" % p for p in pts))
 
 
+def _cells(b, cell):
+    """The grid cells an axis-aligned box touches."""
+    for gx in range(math.floor(b[0] / cell), math.floor(b[2] / cell) + 1):
+        for gy in range(math.floor(b[1] / cell), math.floor(b[3] / cell) + 1):
+            yield gx, gy
+
+
+def _bucket(boxes, cell):
+    """A uniform-grid spatial index: cell -> indices of the boxes that touch it."""
+    grid = collections.defaultdict(list)
+    for i, b in enumerate(boxes):
+        for c in _cells(b, cell):
+            grid[c].append(i)
+    return grid
+
+
+def _near(grid, b, cell):
+    """Indices of every bucketed box that shares a cell with `b`, each once, in order."""
+    return sorted({i for c in _cells(b, cell) for i in grid.get(c, ())})
+
+
+def _extent(edges, pos):
+    """Per-edge bounding boxes, and a grid cell about one typical edge across."""
+    boxes = [(min(pos[a][0], pos[b][0]), min(pos[a][1], pos[b][1]),
+              max(pos[a][0], pos[b][0]), max(pos[a][1], pos[b][1])) for a, b in edges]
+    span = sorted(max(x1 - x0, y1 - y0) for x0, y0, x1, y1 in boxes)
+    return boxes, max(span[len(span) // 2] if span else 0, NODE)
+
+
 def clearance_bad(edges, pos, r=NODE / 2 + 3):
-    """No straight edge may pass through a disc it does not end at."""
+    """No straight edge may pass through a disc it does not end at.
+
+    Only the discs bucketed within `r` of an edge's bounding box are measured, in
+    `pos` order, with the same arithmetic as ever, so the list is unchanged.
+    """
     bad = []
-    for a, b in edges:
+    edges = list(edges)
+    boxes, cell = _extent(edges, pos)
+    names = list(pos)
+    grid = _bucket([(x, y, x, y) for x, y in pos.values()], cell)
+    for (a, b), (x0, y0, x1, y1) in zip(edges, boxes):
         pa, pb = np.array(pos[a], float), np.array(pos[b], float)
         d = pb - pa
         L2 = float(d @ d)
-        for n, p in pos.items():
+        for i in _near(grid, (x0 - r, y0 - r, x1 + r, y1 + r), cell):
+            n = names[i]
             if n in (a, b):
                 continue
-            p = np.array(p, float)
+            p = np.array(pos[n], float)
             t = max(0.0, min(1.0, float((p - pa) @ d) / L2))
             if np.linalg.norm(pa + t * d - p) < r:
                 bad.append((a, b, n))
@@ -325,14 +365,23 @@ def _seg_cross(p1, p2, p3, p4):
 
 
 def crossings(edges, pos):
-    """F2 as a build gate: every pair of non-adjacent edges must not cross."""
-    bad = []
-    for (a, b), (c, d) in itertools.combinations(edges, 2):
-        if len({a, b, c, d}) < 4:
-            continue
-        if _seg_cross(pos[a], pos[b], pos[c], pos[d]):
-            bad.append(((a, b), (c, d)))
-    return bad
+    """F2 as a build gate: every pair of non-adjacent edges must not cross.
+
+    Two segments can only cross if their bounding boxes meet, so only edges that share
+    a grid cell are tested; the pairs come back in `itertools.combinations` order.
+    """
+    edges = list(edges)
+    boxes, cell = _extent(edges, pos)
+    grid = _bucket(boxes, cell)
+    pairs = sorted({(i, j) for ids in grid.values() for i, j in itertools.combinations(ids, 2)
+                    if not (boxes[i][2] < boxes[j][0] or boxes[j][2] < boxes[i][0]
+                            or boxes[i][3] < boxes[j][1] or boxes[j][3] < boxes[i][1])})
+    out = []
+    for i, j in pairs:
+        (a, b), (c, d) = edges[i], edges[j]
+        if len({a, b, c, d}) == 4 and _seg_cross(pos[a], pos[b], pos[c], pos[d]):
+            out.append(((a, b), (c, d)))
+    return out
 
 
 def label_box(x, y, s, anchor, size=FONT, pad=6):
@@ -1402,28 +1451,92 @@ assert abs(ER_MEANK - 6.0) < 0.01 and 6.9 < ER_KAPPA < 7.2, (ER_MEANK, ER_KAPPA)
 assert SF_KAPPA > 15, SF_KAPPA
 
 
-def removal_curve(g, mode, seed=11, steps=40):
+def adaptive_degree_order(g):
+    """Removal order that always takes the node of highest *remaining* degree.
+
+    Degrees live in a bucket queue: one heap of node positions per degree, plus a
+    pointer to the highest non-empty bucket. A node whose degree drops is pushed into
+    its new bucket and its old entry is skipped when it surfaces, so a removal costs
+    its own edges and never a scan of the survivors. Ties go to the node earliest in
+    g, which is the lowest node for the generated graphs here.
+    """
+    nodes = list(g.nodes())
+    pos = {v: i for i, v in enumerate(nodes)}
+    deg = [g.degree(v) for v in nodes]
+    buckets = collections.defaultdict(list)
+    for i, d in enumerate(deg):
+        buckets[d].append(i)
+    for b in buckets.values():
+        heapq.heapify(b)
+    alive, top, order = [True] * len(nodes), max(deg, default=0), []
+    while len(order) < len(nodes):
+        while not buckets[top]:
+            top -= 1
+        i = heapq.heappop(buckets[top])
+        if not alive[i] or deg[i] != top:
+            continue                                    # stale: moved to a lower bucket
+        alive[i] = False
+        order.append(nodes[i])
+        for u in g.neighbors(nodes[i]):
+            j = pos[u]
+            if alive[j]:
+                deg[j] -= 1
+                heapq.heappush(buckets[deg[j]], j)
+    return order
+
+
+def giant_after(g, order):
+    """Giant-component share after each prefix of `order` is removed, 0..len(order).
+
+    Replayed backwards: the survivors are joined first, then the removed nodes come
+    back last-first through a union-find, so the whole curve is one pass over the
+    edges instead of a component search per step.
+    """
     n0 = g.number_of_nodes()
-    rng = np.random.default_rng(seed)
-    h = g.copy()
-    fixed = sorted(g.nodes(), key=lambda x: -g.degree(x))
-    xs, ys, removed, i = [0.0], [1.0], [], 0
-    per = max(1, n0 // steps)
-    while h.number_of_nodes() > per:
-        if mode == "random":
-            pick = list(rng.choice(list(h.nodes()), size=per, replace=False))
-        elif mode == "fixed":
-            pick, i = fixed[i:i + per], i + per
-        else:
-            pick = sorted(h.nodes(), key=lambda x: -h.degree(x))[:per]
-        removed += pick
-        h.remove_nodes_from(pick)
-        hh = g.copy()
-        hh.remove_nodes_from(removed)
-        xs.append(len(removed) / n0)
-        ys.append(len(max(nx.connected_components(hh), key=len)) / n0
-                  if hh.number_of_nodes() else 0.0)
-    return xs, ys
+    parent, size = {}, {}
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def add(v):
+        parent[v], size[v] = v, 1
+        for u in g.neighbors(v):
+            if u in parent:
+                a, b = find(u), find(v)
+                if a != b:
+                    if size[a] < size[b]:
+                        a, b = b, a
+                    parent[b] = a
+                    size[a] += size[b]
+        return size[find(v)]
+
+    gone = set(order)
+    big = max((add(v) for v in g.nodes() if v not in gone), default=0)
+    ys = [big / n0]
+    for v in reversed(order):
+        big = max(big, add(v))
+        ys.append(big / n0)
+    return ys[::-1]
+
+
+def removal_curve(g, mode, seed=11):
+    """(xs, ys): the giant component after every single removal, to the last node.
+
+    random   : a uniformly shuffled order
+    fixed    : ranked once by the starting degree
+    targeted : re-ranked after every removal (`adaptive_degree_order`)
+    """
+    n0 = g.number_of_nodes()
+    if mode == "random":
+        order = list(np.random.default_rng(seed).permutation(list(g.nodes())).tolist())
+    elif mode == "fixed":
+        order = sorted(g.nodes(), key=lambda x: -g.degree(x))
+    else:
+        order = adaptive_degree_order(g)
+    return [k / n0 for k in range(n0 + 1)], giant_after(g, order)
 
 
 CURVES = {(g, m): removal_curve(gr, m)
@@ -1479,10 +1592,30 @@ def sim_axes(xlab="fraction of nodes removed", ylab="giant component"):
                 xfmt=lambda v: f"{v:g}", yfmt=lambda v: f"{v:g}")
 
 
+def _thin(pts, tol=0.5):
+    """Douglas-Peucker: the fewest vertices that stay within `tol` bp of every point."""
+    keep, stack = {0, len(pts) - 1}, [(0, len(pts) - 1)]
+    while stack:
+        a, b = stack.pop()
+        (x0, y0), (x1, y1) = pts[a], pts[b]
+        L = math.hypot(x1 - x0, y1 - y0) or 1.0
+        far, at = max(((abs((x1 - x0) * (y0 - y) - (x0 - x) * (y1 - y0)) / L, i)
+                       for i, (x, y) in enumerate(pts[a + 1:b], a + 1)), default=(0, a))
+        if far > tol:
+            keep.add(at)
+            stack += [(a, at), (at, b)]
+    return [pts[i] for i in sorted(keep)]
+
+
 def sim_curve(key, col, w=4.0, dash=""):
+    """The measured curve, thinned for drawing.
+
+    Every removal stays in CURVES for `collapse_at`; the line drops the vertices that
+    sit within half a point of it, which is no visible change and a short TikZ path.
+    """
     X, Y = _XY()
     xs, ys = CURVES[key]
-    return polyline([(X(x), Y(y)) for x, y in zip(xs, ys)], color=col, w=w, dash=dash)
+    return polyline(_thin([(X(x), Y(y)) for x, y in zip(xs, ys)]), color=col, w=w, dash=dash)
 
 
 def fig_fixed_vs_adaptive():
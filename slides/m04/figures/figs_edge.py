@@ -105,16 +105,6 @@ def _arrow(p, q, color="black", w=EDGE_W, gap_tail=NODE / 2 + 4, gap_head=NODE /
                color=color, w=w, arrow="-{Stealth[length=14bp,width=11bp]}")
 
 
-def _ccdf_fast(d):
-    """Same quantity as verify_numbers.ccdf, computed in one pass.
-
-    ccdf() is O(distinct x n); the power-law sample has tens of thousands of distinct
-    degrees. Asserted equal to ccdf() on the real array before either is drawn.
-    """
-    k, c = np.unique(np.asarray(d), return_counts=True)
-    return k, 1.0 - np.cumsum(c) / c.sum()
-
-
 def _tail_sketch(x0, y0, x1, y1, color="accent"):
     """A log-log CCDF as a pictogram: two spines and one straight descent."""
     o = seg((x0, y0), (x0, y1), color="annot", w=2.4)
@@ -464,7 +454,6 @@ def _powerlaw_sample(alpha, xmin, n=300000, seed=11):
 def fig_lognormal_trap():
     ln = lognormal_degrees()
     ks_ln, su_ln = ccdf(ln)
-    assert np.allclose(_ccdf_fast(ln)[1], su_ln), "the fast CCDF disagrees with ccdf()"
 
     # C-3. The deck said "three decades". Over a true three decades this log-normal fits
     # to R^2 = 0.983 and -- worse for the slide -- the closest power law then stands
@@ -478,7 +467,7 @@ def fig_lognormal_trap():
 
     err, alpha, logc = _minimax_powerlaw(ks_ln, su_ln)
     pl = _powerlaw_sample(alpha, 10 ** (logc / alpha))
-    ks_pl, su_pl = _ccdf_fast(pl)
+    ks_pl, su_pl = ccdf(pl)
     _, _, r2_pl, _ = ccdf_fit(ks_pl, su_pl, KLO, KHI)
     assert r2_pl > 0.99, r2_pl
 
@@ -29,7 +29,7 @@ from figlib import (ACCENT2, DASH, EDGE_W, FONT, NODE, PXBP, SMALLNODE,
                     text)
 from verify_numbers import (FELD_EDGES, FELD_ORDER, LITERATURE, MARKETVILLE_ABOVE,
                             MARKETVILLE_BELOW, MARKETVILLE_EQUAL, MARKETVILLE_PK,
-                            condmat, immunization_curves, internet_as, moments,
+                            condmat, immunization_ensemble, internet_as_csr, moments,
                             net_stats, paradox_share)
 
 FULL_H = 420          # page height for a full-width figure; the crop trims it to the ink
@@ -1211,15 +1211,14 @@ IMM_SEEDS = tuple(range(1, 13))
 def _imm():
     """Twelve realisations, averaged.
 
-    One realisation of `random` is noisy enough to run UPWARDS as more nodes are
-    immunised (0.947 at f = 0.02 against 0.953 at f = 0.04 on the module's default
-    seed), which is a visible lie on a monotone process.  Averaging removes it and
-    the curves come out monotone, which is asserted below.
+    One realisation of `random` used to be noisy enough to run UPWARDS as more nodes
+    were immunised (0.947 at f = 0.02 against 0.953 at f = 0.04 on the module's
+    default seed), which is a visible lie on a monotone process.  Each realisation is
+    now one nested removal order, so it cannot run upwards; the average is what the
+    slide quotes, and the curves are still asserted monotone below.
     """
-    g = internet_as()
-    runs = [immunization_curves(g, list(IMM_F), seed=s) for s in IMM_SEEDS]
-    out = {k: [float(np.mean([r[k][i] for r in runs])) for i in range(len(IMM_F))]
-           for k in ("random", "acquaintance", "degree")}
+    ens = immunization_ensemble(internet_as_csr(), list(IMM_F), IMM_SEEDS)
+    out = ens["mean"]
     for k, v in out.items():
         assert v[0] == 1.0, k
         assert all(a >= b - 1e-12 for a, b in zip(v, v[1:])), f"{k} is not monotone: {v}"
@@ -86,9 +86,8 @@ def condmat_degrees():
 @lru_cache(maxsize=None)
 def condmat_pdf():
     """(distinct degrees, p(k) at each, N).  One point per observed degree, no bins."""
-    d = np.array(condmat_degrees())
-    ks = np.array(sorted(set(d.tolist())))
-    return ks, np.array([(d == k).mean() for k in ks]), len(d)
+    ks, counts = np.unique(np.array(condmat_degrees()), return_counts=True)
+    return ks, counts / counts.sum(), int(counts.sum())
 
 
 @lru_cache(maxsize=None)
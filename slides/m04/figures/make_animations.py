@@ -41,7 +41,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from figlib import (  # noqa: E402
     CONTAINER, DESIGN, FIG_H, FONT, INK_FILL_MIN, NODE, NODE_MAX_PX, NODE_MIN_PX, OUT,
-    PAD, PXBP, TEXT_MIN_PX, calibrate, render, ring, text,
+    PAD, PXBP, TEXT_MIN_PX, calibrate, luma, render_batch, ring, text,
 )
 from figs_tail import (  # noqa: E402
     GROWTH_N, QUIZ_B, ba_frames, draw_growth, growth_edges, growth_layout,
@@ -76,11 +76,11 @@ def emit_gif(name, frames, container="full", h=None, hmod="", hold=HOLD, ms=MS,
     got there". The frames themselves are untouched.
     """
     w = DESIGN[container]
-    ims = [render(body, w, h or int(w * 0.70)) for body in frames]
+    ims = render_batch([(body, w, h or int(w * 0.70)) for body in frames])
 
     box = None
     for im in ims:
-        a = np.array(im.convert("L"))
+        a = luma(im)
         ys, xs = np.where(a < 200)
         assert len(ys), f"{name}: a frame is blank"
         b = (xs.min(), ys.min(), xs.max(), ys.max())
@@ -88,15 +88,15 @@ def emit_gif(name, frames, container="full", h=None, hmod="", hold=HOLD, ms=MS,
                                      max(box[2], b[2]), max(box[3], b[3]))
     edge = 2
     touched = [s for s, hit in (("left", box[0] <= edge), ("top", box[1] <= edge),
-                                ("right", box[2] >= ims[0].size[0] - 1 - edge),
-                                ("bottom", box[3] >= ims[0].size[1] - 1 - edge)) if hit]
+                                ("right", box[2] >= ims[0].shape[1] - 1 - edge),
+                                ("bottom", box[3] >= ims[0].shape[0] - 1 - edge)) if hit]
     assert not touched, f"{name}: ink runs off the {', '.join(touched)} edge -- CLIPPED"
 
     pad = int(PAD * PXBP)
-    lo, hi = max(0, box[1] - pad), min(ims[0].size[1], box[3] + pad)
-    ims = [im.crop((0, lo, im.size[0], hi)) for im in ims]
+    lo, hi = max(0, box[1] - pad), min(ims[0].shape[0], box[3] + pad)
+    ims = [im[lo:hi] for im in ims]
 
-    fw, fh = ims[0].size
+    fh, fw = ims[0].shape[:2]
     hcap = FIG_H[hmod]
     factor = min(CONTAINER[container] / fw, hcap / fh, 1.0) * PXBP
     want = CONTAINER[container] / w
@@ -111,7 +111,7 @@ def emit_gif(name, frames, container="full", h=None, hmod="", hold=HOLD, ms=MS,
     assert x_px >= TEXT_MIN_PX, f"{name}: text x-height {x_px:.1f}px on the slide"
 
     seq = [ims[-1]] * lead + ims + [ims[-1]] * hold
-    pal = [im.convert("P", palette=Image.ADAPTIVE) for im in seq]
+    pal = [Image.fromarray(im).convert("P", palette=Image.ADAPTIVE) for im in seq]
     pal[0].save(OUT / f"{name}.gif", save_all=True, append_images=pal[1:],
                 optimize=False, duration=ms, loop=0, disposal=2)
     # Report what the FILE holds, not what was handed to the encoder: PIL merges a run
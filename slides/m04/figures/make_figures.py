@@ -3,6 +3,7 @@
 
     python3 figures/make_figures.py            # all of them
     python3 figures/make_figures.py feld       # only figures whose name contains "feld"
+    python3 figures/make_figures.py -j 8       # eight figures at a time, same output
 
 The pipeline and every gate live in `figlib.py`; every number lives in
 `verify_numbers.py`; the shared layout of Feld's eight girls lives in `feld.py`. The
@@ -16,6 +16,10 @@ Data (downloaded into figures/data/, all public):
 """
 
 import gzip
+import hashlib
+import os
+import shutil
+import weakref
 from fractions import Fraction
 from functools import lru_cache
 from pathlib import Path
@@ -167,32 +171,101 @@ def check_toys(verbose=True):
 
 
 # =========================================================================== real networks
-def _load_snap(name):
-    g = nx.Graph()
-    with gzip.open(DATA / name, "rt") as fh:
+# Parsing the text sources is most of a cold run, and every figure script runs in its own
+# process, so each source is converted once into int32 edges plus a CSR, saved as .npy
+# under CACHE keyed by the source's hash, and memory-mapped on every later load.  Code that
+# only needs the CSR takes it from `_csr` and never builds the nx graph.
+CACHE = HERE / ".cache"
+_CSR = weakref.WeakKeyDictionary()         # graph -> (nodes, indptr, indices), see _adjacency
+_PARTS = ("edges", "labels", "indptr", "indices")
+
+
+def _parse_snap(path):
+    with gzip.open(path, "rt") as fh:
         for line in fh:
             if line.startswith("#"):
                 continue
             a, b = line.split()[:2]
-            if a != b:
-                g.add_edge(int(a), int(b))
-    return g
+            yield int(a), int(b)
 
 
-def _load_mtx(name):
-    g = nx.Graph()
-    for line in open(DATA / name):
+def _parse_mtx(path):
+    for line in open(path):
         if line.startswith("%"):
             continue
         f = line.split()
         if len(f) < 2:
             continue
         try:
-            a, b = int(f[0]), int(f[1])
+            yield int(f[0]), int(f[1])
         except ValueError:
             continue
-        if a != b:
-            g.add_edge(a, b)
+
+
+def dataset(name):
+    """(edges, labels, indptr, indices) for a file in DATA, memory-mapped.
+
+    edges  : every non-loop edge line, in file order (duplicates kept, so the nx view
+             is built exactly as the text loader built it)
+    labels : node ids in order of first appearance -- networkx's node order
+    indptr, indices : the simple undirected graph as CSR over those rows
+    """
+    src = DATA / name
+    st = src.stat()
+    key = CACHE / f"{name}-{_digest(src, st.st_size, st.st_mtime_ns)}"
+    if not _complete(key):
+        parse = _parse_mtx if name.endswith(".mtx") else _parse_snap
+        e = np.array([ab for ab in parse(src) if ab[0] != ab[1]], dtype=np.int64).reshape(-1, 2)
+        assert e.size == 0 or e.max() < 2 ** 31, f"{name}: node ids do not fit int32"
+        ids, first = np.unique(e.ravel(), return_index=True)
+        labels = ids[np.argsort(first)]
+        row = np.empty(len(ids), np.int64)
+        row[np.argsort(first)] = np.arange(len(ids))
+        r = row[np.searchsorted(ids, e)]
+        r = np.unique(np.sort(r, axis=1), axis=0)
+        r = np.concatenate([r, r[:, ::-1]])
+        r = r[np.lexsort((r[:, 1], r[:, 0]))]
+        parts = {"edges": e.astype(np.int32), "labels": labels.astype(np.int32),
+                 "indptr": np.searchsorted(r[:, 0], np.arange(len(ids) + 1)),
+                 "indices": r[:, 1].astype(np.int32)}
+        tmp = key.with_name(f"{key.name}.{os.getpid()}.tmp")
+        tmp.mkdir(parents=True, exist_ok=True)
+        for part, arr in parts.items():
+            np.save(tmp / f"{part}.npy", arr)
+        if key.exists() and not _complete(key):     # left partial: it would block the rename
+            shutil.rmtree(key, ignore_errors=True)
+        try:
+            os.replace(tmp, key)
+        except OSError:                     # another process converted it first
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not _complete(key):
+                raise
+    return tuple(np.load(key / f"{part}.npy", mmap_mode="r") for part in _PARTS)
+
+
+def _complete(key):
+    """Whether a cache dir holds every part; os.replace publishes all of them at once."""
+    return all((key / f"{part}.npy").exists() for part in _PARTS)
+
+
+@lru_cache(maxsize=None)
+def _digest(src, size, mtime_ns):
+    """The source's content hash, read once per process and per (size, mtime)."""
+    return hashlib.sha256(src.read_bytes()).hexdigest()[:16]
+
+
+@lru_cache(maxsize=None)
+def _csr(name):
+    """(nodes, indptr, indices) of a dataset straight from the memory-mapped cache."""
+    _, labels, indptr, indices = dataset(name)
+    return labels.tolist(), indptr, indices
+
+
+def _load(name):
+    """The nx view of a dataset, with its cached CSR already in place for _adjacency."""
+    g = nx.Graph()
+    g.add_edges_from(dataset(name)[0].tolist())
+    _CSR[g] = _csr(name)
     return g
 
 
@@ -205,24 +278,60 @@ def condmat():
     0.920 (HepTh, whose tail stops at k=65) and 0.931 (AstroPh, which has a visible
     shoulder).  Part 5's slide claims "roughly a straight line" and has to be true.
     """
-    return _load_snap("ca-CondMat.txt.gz")
+    return _load("ca-CondMat.txt.gz")
 
 
 @lru_cache(maxsize=None)
 def internet_as():
-    return _load_snap("as20000102.txt.gz")
+    return _load("as20000102.txt.gz")
+
+
+def internet_as_csr():
+    """`internet_as()` as (nodes, indptr, indices), without building the graph."""
+    return _csr("as20000102.txt.gz")
 
 
 @lru_cache(maxsize=None)
 def yeast_ppi():
-    return _load_mtx("bio-yeast.mtx")
+    return _load("bio-yeast.mtx")
+
+
+def _adjacency(g):
+    """(nodes, indptr, indices): g as CSR index arrays, rows in g's node order.
+
+    Built once per graph object and kept while the graph is alive; the graphs here
+    are loaded and then only read.  A CSR tuple (from `_csr`) is passed through.
+    """
+    if isinstance(g, tuple):
+        return g
+    if g not in _CSR:
+        nodes = list(g.nodes())
+        idx = {v: i for i, v in enumerate(nodes)}
+        e = np.array([(idx[a], idx[b]) for a, b in g.edges()], dtype=np.int64).reshape(-1, 2)
+        e = np.concatenate([e, e[:, ::-1]])
+        e = e[np.argsort(e[:, 0], kind="stable")]
+        _CSR[g] = nodes, np.searchsorted(e[:, 0], np.arange(len(nodes) + 1)), e[:, 1]
+    return _CSR[g]
+
+
+def degree_array(g):
+    """Degrees in g's node order, from the CSR row lengths."""
+    return np.diff(_adjacency(g)[1])
+
+
+def friend_sums(g):
+    """Total degree of each node's neighbours: A d as one weighted bincount over CSR."""
+    _, indptr, indices = _adjacency(g)
+    d = np.diff(indptr)
+    rows = np.repeat(np.arange(len(d)), d)
+    return np.bincount(rows, weights=d[indices], minlength=len(d)).astype(np.int64)
 
 
 def ccdf(degrees):
     """Empirical CCDF(k) = P(k' > k) at each distinct observed degree."""
-    d = np.asarray(list(degrees))
-    ks = np.array(sorted(set(d.tolist())))
-    return ks, np.array([(d > k).mean() for k in ks])
+    d = np.sort(np.asarray(list(degrees)))
+    ks = np.unique(d)
+    return ks, (len(d) - np.searchsorted(d, ks, side="right")) / len(d)
 
 
 def ccdf_fit(ks, surv, kmin, kmax):
@@ -235,7 +344,7 @@ def ccdf_fit(ks, surv, kmin, kmax):
 
 
 def net_stats(g):
-    d = np.array([x for _, x in g.degree()], float)
+    d = degree_array(g).astype(float)
     k1, k2 = d.mean(), (d ** 2).mean()
     return {"N": g.number_of_nodes(), "M": g.number_of_edges(), "k1": k1, "k2": k2,
             "var": k2 - k1 * k1, "friend": k2 / k1, "gap": (k2 - k1 * k1) / k1,
@@ -244,18 +353,101 @@ def net_stats(g):
 
 def paradox_share(g):
     """Fraction of nodes whose friends' MEAN degree strictly exceeds their own."""
-    hit = [np.mean([g.degree(u) for u in g.neighbors(v)]) > g.degree(v)
-           for v in g.nodes() if g.degree(v) > 0]
-    return float(np.mean(hit))
+    d, s = degree_array(g), friend_sums(g)
+    has = d > 0
+    return float(np.mean(s[has] > d[has] * d[has]))
 
 
 def top_share(g, p):
     """(count, share of all edge ends) held by the top p fraction of nodes by degree."""
-    d = np.sort(np.array([x for _, x in g.degree()]))[::-1]
+    d = np.sort(degree_array(g))[::-1]
     n = int(round(len(d) * p))
     return n, float(d[:n].sum() / d.sum())
 
 
+def giant_curve(indptr, indices, order):
+    """Giant-component share after removing order[:m], for every m = 0 .. len(order).
+
+    One reverse pass: start from the graph with all of `order` removed and add the
+    nodes back last-first, merging components with union-find, so the whole curve
+    costs one sweep over the edges instead of a component scan per point.
+    """
+    N = len(indptr) - 1
+    ptr, nbr = indptr.tolist(), indices.tolist()
+    parent, size = list(range(N)), [1] * N
+    alive = [True] * N
+    for v in order:
+        alive[v] = False
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def attach(v):
+        rv = find(v)
+        for u in nbr[ptr[v]:ptr[v + 1]]:
+            if alive[u]:
+                ru = find(u)
+                if ru != rv:
+                    if size[ru] > size[rv]:
+                        ru, rv = rv, ru
+                    parent[ru] = rv
+                    size[rv] += size[ru]
+        return size[rv]
+
+    best = 0
+    for v in range(N):
+        if alive[v]:
+            best = max(best, attach(v))
+    out = [best]
+    for v in reversed(order):
+        alive[v] = True
+        best = max(best, attach(v))
+        out.append(best)
+    return np.array(out[::-1], float) / N
+
+
+def acquaintance_order(indptr, indices, m, rng, guard=60):
+    """Distinct nodes in the order acquaintance immunisation first names them.
+
+    Each nomination picks a node uniformly and names one of its neighbours uniformly;
+    stops at m distinct names or after guard * N nominations, whichever comes first.
+    """
+    N = len(indptr) - 1
+    deg = np.diff(indptr)
+    seen, order, tries = np.zeros(N, bool), [], 0
+    while len(order) < m and tries < guard * N:
+        k = min(max(2 * (m - len(order)), 1024), guard * N - tries)
+        tries += k
+        u = rng.integers(N, size=k)
+        u = u[deg[u] > 0]
+        for w in indices[indptr[u] + (rng.random(len(u)) * deg[u]).astype(np.int64)].tolist():
+            if not seen[w]:
+                seen[w] = True
+                order.append(w)
+                if len(order) == m:
+                    break
+    return np.array(order, dtype=np.int64)
+
+
+def _immunization_run(csr, fractions, seed):
+    rng = np.random.default_rng(seed)
+    _, indptr, indices = csr
+    N = len(indptr) - 1
+    ms = [int(N * f) for f in fractions]
+    top = max(ms, default=0)
+    orders = {"random": rng.permutation(N),
+              "acquaintance": acquaintance_order(indptr, indices, top, rng),
+              "degree": np.argsort(-np.diff(indptr), kind="stable")}
+    out = {"f": list(fractions)}
+    for key, order in orders.items():
+        curve = giant_curve(indptr, indices, order[:top])
+        out[key] = [float(curve[min(m, len(curve) - 1)]) for m in ms]
+    return out
+
+
 def immunization_curves(g, fractions, seed=5):
     """Giant-component share left after immunising f of the nodes, three ways.
 
@@ -263,32 +455,27 @@ def immunization_curves(g, fractions, seed=5):
     acquaintance  : choose a node uniformly, immunise ONE of its neighbours (Cohen,
                     Havlin & ben-Avraham 2003) -- the degree bias does the targeting
     degree        : the true top-degree nodes, which needs the whole map
+
+    Each strategy is one removal order, and the share at f is read off its
+    `giant_curve` at m = int(N f), so the immunised sets are nested across f.
+    g is a graph or the CSR tuple `internet_as_csr()` returns.
     """
-    rng = np.random.default_rng(seed)
-    N = g.number_of_nodes()
-    nodes = list(g.nodes())
-    by_degree = [v for v, _ in sorted(g.degree(), key=lambda t: -t[1])]
-
-    def gcc(removed):
-        h = g.copy()
-        h.remove_nodes_from(removed)
-        if h.number_of_nodes() == 0:
-            return 0.0
-        return max((len(c) for c in nx.connected_components(h)), default=0) / N
-
-    out = {"f": list(fractions), "random": [], "acquaintance": [], "degree": []}
-    for f in fractions:
-        m = int(N * f)
-        out["random"].append(gcc(rng.choice(nodes, m, replace=False) if m else []))
-        chosen, guard = set(), 0
-        while len(chosen) < m and guard < 60 * N:
-            guard += 1
-            nb = list(g.neighbors(nodes[rng.integers(N)]))
-            if nb:
-                chosen.add(nb[rng.integers(len(nb))])
-        out["acquaintance"].append(gcc(list(chosen)))
-        out["degree"].append(gcc(by_degree[:m]))
-    return out
+    return _immunization_run(_adjacency(g), fractions, seed)
+
+
+def immunization_ensemble(g, fractions, seeds, band=0.95):
+    """`immunization_curves` over every seed: the runs, their mean and a percentile band.
+
+    runs[k] is (len(seeds), len(fractions)); band[k] is the (lo, hi) envelope holding
+    the central `band` share of the runs at each f.
+    """
+    csr = _adjacency(g)
+    per = [_immunization_run(csr, fractions, s) for s in seeds]
+    runs = {k: np.array([r[k] for r in per]) for k in ("random", "acquaintance", "degree")}
+    q = 50 * (1 - band), 50 * (1 + band)
+    return {"f": list(fractions), "runs": runs,
+            "mean": {k: r.mean(axis=0).tolist() for k, r in runs.items()},
+            "band": {k: tuple(np.percentile(r, q, axis=0)) for k, r in runs.items()}}
 
 
 def check_real(verbose=True):
@@ -326,6 +513,20 @@ def check_real(verbose=True):
     return out
 
 
+def check_immunization(verbose=True, fractions=(0.02, 0.05, 0.10, 0.20), seeds=range(1, 13)):
+    """Part 4's table and slide 45's 88% / 2%: the mean over the figure's twelve seeds."""
+    mean = immunization_ensemble(internet_as_csr(), list(fractions), list(seeds))["mean"]
+    if verbose:
+        print("\n--- immunization, Internet AS graph (mean of %d seeds) ---" % len(seeds))
+        print("  f      random  acquaintance  degree")
+        for i, f in enumerate(fractions):
+            print(f"  {f:.2f}   {mean['random'][i]:.3f}   {mean['acquaintance'][i]:.3f}"
+                  f"         {mean['degree'][i]:.3f}")
+    at10 = {k: v[fractions.index(0.10)] for k, v in mean.items()}
+    assert at10["random"] > at10["acquaintance"] > at10["degree"], at10
+    return mean
+
+
 # =========================================================================== models
 def ba_graph(n=20000, m=2, seed=7):
     return nx.barabasi_albert_graph(n, m, seed=seed)
@@ -486,6 +687,7 @@ if __name__ == "__main__":
     check_marketville()
     check_toys()
     check_real()
+    check_immunization()
     check_models()
     check_lognormal()
     print(LITERATURE)
@@ -31,7 +31,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 import verify_numbers as V                                             # noqa: E402
 from figlib import (                                                   # noqa: E402
     CONTAINER, DESIGN, FIG_H, FONT, INK_FILL_MIN, NODE_MAX_PX, NODE_MIN_PX, OUT, PAD,
-    PXBP, TEXT_MIN_PX, calibrate, disc, render, seg, text,
+    PXBP, TEXT_MIN_PX, calibrate, disc, luma, render_batch, seg, text,
 )
 from figs_chance import WS_E, WS_LEFT, WS_POS                          # noqa: E402
 from kfig import (                                                     # noqa: E402
@@ -51,26 +51,26 @@ def emit_gif(name, frames, container="full", h=380, hmod="", hold=HOLD, ms=MS):
         return
     try:
         w = DESIGN[container]
-        ims = [render(body, w, h) for body in frames]
+        ims = render_batch([(body, w, h) for body in frames])
         box = None
         for im in ims:
-            a = np.array(im.convert("L"))
+            a = luma(im)
             ys, xs = np.where(a < 200)
             assert len(ys), f"{name}: a frame is blank"
             b = (xs.min(), ys.min(), xs.max(), ys.max())
             box = b if box is None else (min(box[0], b[0]), min(box[1], b[1]),
                                          max(box[2], b[2]), max(box[3], b[3]))
         edge = 2
-        assert not (box[0] <= edge or box[2] >= ims[0].size[0] - 1 - edge
-                    or box[1] <= edge or box[3] >= ims[0].size[1] - 1 - edge), (
+        assert not (box[0] <= edge or box[2] >= ims[0].shape[1] - 1 - edge
+                    or box[1] <= edge or box[3] >= ims[0].shape[0] - 1 - edge), (
             f"{name}: ink runs off the page in some frame -- CLIPPED, not cropped")
 
         pad = int(PAD * PXBP)
         lo = max(0, box[1] - pad)
-        hi = min(ims[0].size[1], box[3] + pad)
-        ims = [im.crop((0, lo, im.size[0], hi)) for im in ims]
+        hi = min(ims[0].shape[0], box[3] + pad)
+        ims = [im[lo:hi] for im in ims]
 
-        fw, fh = ims[0].size
+        fh, fw = ims[0].shape[:2]
         scale = min(CONTAINER[container] / fw, FIG_H[hmod] / fh, 1.0)
         factor = scale * PXBP
         assert abs(factor - CONTAINER[container] / w) < 1e-6, (
@@ -84,7 +84,7 @@ def emit_gif(name, frames, container="full", h=380, hmod="", hold=HOLD, ms=MS):
         assert x_px >= TEXT_MIN_PX, f"{name}: text x-height {x_px:.1f}px on the slide"
 
         seq = ims + [ims[-1]] * hold
-        pal = [im.convert("P", palette=Image.ADAPTIVE) for im in seq]
+        pal = [Image.fromarray(im).convert("P", palette=Image.ADAPTIVE) for im in seq]
         pal[0].save(OUT / f"{name}.gif", save_all=True, append_images=pal[1:],
                     optimize=False, duration=ms, loop=0, disposal=2)
         _built.append(name)
@@ -3,6 +3,7 @@
 
     python3 figures/make_figures.py              # all of them
     python3 figures/make_figures.py karate       # only figures whose name contains it
+    python3 figures/make_figures.py -j 8         # eight figures at a time, same output
 
 The pipeline and every gate live in `figlib.py`; the club's one cached layout lives in
 `layout.py`; the drawing helpers specific to this deck live in `kfig.py`; every number
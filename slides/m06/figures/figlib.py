@@ -15,12 +15,23 @@ is 36px of type and 15.5px of x-height on the slide, with nothing to reconcile.
 Every figure module imports from here; `make_figures.py` is the entry point.
 """
 
+import bisect
+import collections
+import contextlib
+import functools
+import hashlib
+import io
 import itertools
+import json
 import math
+import multiprocessing
+import os
 import re
+import shutil
 import subprocess
 import sys
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from decimal import ROUND_HALF_UP, Decimal
 from pathlib import Path
 
@@ -80,9 +91,11 @@ _failures = []
 
 
 # --------------------------------------------------------------------------- TeX
+# The preamble is split where the page size enters. Everything in PREAMBLE is the same
+# for every figure in the deck, so it can be dumped once into a format (see `_format`).
+# Each PAGE is shipped out at its own size, so one document can hold many figures.
 PREAMBLE = r"""
 \documentclass{article}
-\usepackage[paperwidth=%(W)dbp,paperheight=%(H)dbp,margin=0bp]{geometry}
 \usepackage[T1]{fontenc}
 \usepackage{lmodern}
 \usepackage{tikz}
@@ -93,10 +106,11 @@ PREAMBLE = r"""
 \definecolor{accenttwo}{HTML}{%(ACCENT2)s}
 \definecolor{accentthree}{HTML}{%(ACCENT3)s}
 \definecolor{annot}{HTML}{%(GRAY)s}
-\pagestyle{empty}
-\setlength{\parindent}{0pt}
-\begin{document}%%
-\vbox to \paperheight{\vss\hbox to \paperwidth{\hss%%
+"""
+
+PAGE = r"""
+\pdfpagewidth=%(W)dbp\pdfpageheight=%(H)dbp
+\shipout\vbox to %(H)dbp{\vss\hbox to %(W)dbp{\hss%%
 \begin{tikzpicture}[x=1bp,y=1bp,
     every node/.style={inner sep=0pt,outer sep=0pt},
     disc/.style={circle,draw=none,minimum size=%(NODE)dbp,inner sep=0pt,
@@ -110,42 +124,242 @@ PREAMBLE = r"""
 POSTAMBLE = r"""
 \end{tikzpicture}%
 \hss}\vss}%
+"""
+
+OPEN = r"""
+\pagestyle{empty}
+\setlength{\parindent}{0pt}
+\begin{document}%
+\pdfhorigin=0pt\pdfvorigin=0pt
+"""
+
+CLOSE = r"""
 \end{document}
 """
 
 
-def _tex(body, w, h):
-    return PREAMBLE % dict(W=w, H=h, ACCENT=ACCENT, ACCENT2=ACCENT2, ACCENT3=ACCENT3,
-                           GRAY=GRAY, NODE=NODE, FONT=FONT, LEAD=int(FONT * 1.15),
-                           EDGE=EDGE_W) + body + POSTAMBLE
+def _params(w=0, h=0):
+    return dict(W=w, H=h, ACCENT=ACCENT, ACCENT2=ACCENT2, ACCENT3=ACCENT3, GRAY=GRAY,
+                NODE=NODE, FONT=FONT, LEAD=int(FONT * 1.15), EDGE=EDGE_W)
 
 
-def render(body, w, h):
-    """Compile one TikZ body and return the RGB image, uncropped."""
+def _page(body, w, h):
+    return PAGE % _params(w, h) + body + POSTAMBLE
+
+
+def _tex(pages):
+    return PREAMBLE % _params() + OPEN + "".join(_page(*p) for p in pages) + CLOSE
+
+
+# A rendered page is a pure function of its TeX source, the raster resolution and the
+# two programs that made it, so that is the key -- and an unchanged figure costs no
+# pdflatex and no pdftoppm on the next build. The cache holds pdftoppm's own PNG of the
+# whole page, BEFORE any crop: every gate in `crop_and_check` still runs on every build.
+# `--no-cache` on the command line bypasses it; deleting the directory is always safe.
+CACHE = OUT / ".cache"
+_cache_on = "--no-cache" not in sys.argv
+
+
+@functools.lru_cache(maxsize=None)
+def _toolchain():
+    """First line of `pdflatex --version` and of `pdftoppm -v`, for the cache key."""
+    out = []
+    for cmd in (["pdflatex", "--version"], ["pdftoppm", "-v"]):
+        r = subprocess.run(cmd, capture_output=True, text=True)
+        out += (r.stdout or r.stderr).splitlines()[:1]    # pdftoppm prints to stderr
+    return " | ".join(out)
+
+
+def _cached(tex):
+    key = hashlib.sha256(f"{_toolchain()}\n{DPI}\n{tex}".encode()).hexdigest()
+    return CACHE / f"{key}.png"
+
+
+def _load_rgb(path):
+    with Image.open(path) as im:
+        return np.asarray(im.convert("RGB"))
+
+
+_PPM = re.compile(rb"P6\s+(\d+)\s+(\d+)\s+255\s")
+
+
+def _ppm_pages(data):
+    """pdftoppm's stdout -- one binary PPM per page, back to back -- as RGB arrays.
+
+    Nothing is decoded: each page is a view into the bytes pdftoppm wrote.
+    """
+    pages, at = [], 0
+    while at < len(data):
+        head = _PPM.match(data, at)
+        assert head, f"pdftoppm wrote something other than a PPM at byte {at}"
+        w, h = int(head.group(1)), int(head.group(2))
+        at = head.end()
+        pages.append(np.frombuffer(data, np.uint8, w * h * 3, at).reshape(h, w, 3))
+        at += w * h * 3
+    return pages
+
+
+def luma(a):
+    """An RGB array as 8-bit gray, by the integer formula PIL's convert("L") uses, so
+    every `< 200` ink test reads exactly the pixels it read on a PIL image."""
+    a = a.astype(np.uint32)
+    return ((a[..., 0] * 19595 + a[..., 1] * 38470 + a[..., 2] * 7471 + 0x8000)
+            >> 16).astype(np.uint8)
+
+
+# Small drawings spend most of their pdflatex time loading tikz and lmodern, the same
+# way every time. So PREAMBLE is dumped once into a format with mylatexformat, named by
+# the hash of its text as substituted -- the packages, the libraries and the palette --
+# so editing any of them simply names a new format. The fonts at figure size are still
+# loaded per page, which keeps the "not available" substitution check honest on this
+# path. `--no-fmt` compiles the preamble every time, as before.
+_fmt_on = "--no-fmt" not in sys.argv
+
+
+@functools.lru_cache(maxsize=None)
+def _format():
+    """The name of the dumped PREAMBLE format in CACHE, or None where it cannot be built."""
+    if not _fmt_on:
+        return None
+    head = PREAMBLE % _params()
+    name = "figpre-" + hashlib.sha256(f"{_toolchain()}\n{head}".encode()).hexdigest()[:16]
+    if (CACHE / f"{name}.fmt").exists():
+        return name
     with tempfile.TemporaryDirectory() as td:
         td = Path(td)
-        (td / "f.tex").write_text(_tex(body, w, h))
-        r = subprocess.run(["pdflatex", "-interaction=nonstopmode", "-halt-on-error", "f.tex"],
+        (td / "pre.tex").write_text(head + "\\endofdump\n")
+        r = subprocess.run(["pdflatex", "-ini", f"-jobname={name}", "&pdflatex",
+                            "mylatexformat.ltx", "pre.tex"],
                            cwd=td, capture_output=True, text=True)
+        if r.returncode or not (td / f"{name}.fmt").exists():
+            print("  note: the preamble could not be dumped to a format (is mylatexformat "
+                  "installed?) -- compiling it for every figure instead")
+            return None
+        CACHE.mkdir(exist_ok=True)
+        tmp = CACHE / f"{name}.{os.getpid()}.tmp"
+        shutil.copyfile(td / f"{name}.fmt", tmp)
+        os.replace(tmp, CACHE / f"{name}.fmt")
+    return name
+
+
+def _pdflatex(td, tex):
+    """Compile `tex` as f.tex in `td`, through the dumped preamble when there is one.
+
+    A mylatexformat format skips its source up to `\\endofdump`, so the marker goes
+    exactly where PREAMBLE ends and the page setup begins.
+    """
+    cmd = ["pdflatex", "-interaction=nonstopmode", "-halt-on-error"]
+    env = None
+    fmt = _format()
+    if fmt:
+        head = PREAMBLE % _params()
+        assert tex.startswith(head), "the page does not open with PREAMBLE"
+        tex = head + "\\endofdump" + tex[len(head):]
+        cmd.append(f"-fmt={fmt}")
+        env = {**os.environ, "TEXFORMATS": f"{CACHE}{os.pathsep}"}
+    (td / "f.tex").write_text(tex)
+    return subprocess.run(cmd + ["f.tex"], cwd=td, env=env, capture_output=True, text=True)
+
+
+class TexError(SystemExit):
+    """pdflatex refused a batch. `page` is the index of the body it stopped in, when
+    the log says, so a caller can drop that body and compile the rest."""
+
+    def __init__(self, msg, page=None):
+        super().__init__(msg)
+        self.page = page
+
+
+def _store(a, key):
+    # Written aside and renamed, so a parallel worker never reads half a file. Level 1:
+    # this is a cache, and the encode is paid on every miss.
+    CACHE.mkdir(exist_ok=True)
+    tmp = key.with_suffix(f".{os.getpid()}.tmp")
+    Image.fromarray(a).save(tmp, format="PNG", compress_level=1)
+    os.replace(tmp, key)
+
+
+def render_batch(pages):
+    """Compile (body, w, h) pages as the pages of ONE document; return their RGB arrays.
+
+    A GIF's frames, or a pool worker's run of figures, then cost one pdflatex and one
+    pdftoppm between them instead of a pair each. Each page is shipped at its own size
+    and cached under its own one-page key, so a page is the same image whichever batch
+    drew it and a cached one is never recompiled. A TeX error raises TexError naming
+    the body it stopped in.
+
+    pdftoppm writes raw PPM to a pipe and the pixels are read straight into arrays: a
+    full-width page is a 4320px raster, and writing it out as PNG only to decode it
+    again was most of the I/O a figure did. The one PNG encode left is the figure's own,
+    in `_finish`.
+    """
+    pages = list(pages)
+    keys = [_cached(_tex([p])) if _cache_on else None for p in pages]
+    out = [_load_rgb(k) if k is not None and k.exists() else None for k in keys]
+    todo = [i for i, im in enumerate(out) if im is None]
+    if not todo:
+        return out
+
+    src, starts = [PREAMBLE % _params(), OPEN], []
+    for i in todo:
+        starts.append(sum(s.count("\n") for s in src) + 1)
+        src.append(_page(*pages[i]))
+    src.append(CLOSE)
+
+    def culprit(line):
+        """The batch index of the page whose source holds line `line` of f.tex."""
+        k = bisect.bisect_right(starts, line) - 1
+        return todo[k] if k >= 0 else None
+
+    def where(i):
+        if i is None or len(pages) == 1:
+            return ""
+        first = next((l.strip() for l in pages[i][0].splitlines() if l.strip()), "")
+        return f" in body {i + 1} of {len(pages)} ({first[:60]!r})"
+
+    with tempfile.TemporaryDirectory() as td:
+        td = Path(td)
+        r = _pdflatex(td, "".join(src))
         if r.returncode:
-            raise SystemExit("pdflatex failed\n" + "\n".join(r.stdout.splitlines()[-25:]))
+            at = re.findall(r"^l\.(\d+)", r.stdout, re.M)
+            i = culprit(int(at[-1])) if at else None
+            raise TexError(f"pdflatex failed{where(i)}\n"
+                           + "\n".join(r.stdout.splitlines()[-25:]), i)
         # Stock Computer Modern has no 36pt design size and LaTeX substitutes silently;
         # m02 shipped a whole deck 17% under the type floor that way. lmodern fixes it,
         # and this turns any remaining substitution into a build failure.
         if "not available" in r.stdout:
             bad = [l for l in r.stdout.splitlines() if "not available" in l]
-            raise SystemExit("LaTeX substituted a font size:\n  " + "\n  ".join(bad))
-        subprocess.run(["pdftoppm", "-png", "-r", str(DPI), "-singlefile", "f.pdf", "f"],
-                       cwd=td, check=True)
-        im = Image.open(td / "f.png").convert("RGB")
-        im.load()
-    return im
+            at = re.search(r"not available.*?input\s+line\s+(\d+)", r.stdout, re.S)
+            i = culprit(int(at.group(1))) if at else None
+            raise TexError(f"LaTeX substituted a font size{where(i)}:\n  "
+                           + "\n  ".join(bad), i)
+        ppm = subprocess.run(["pdftoppm", "-r", str(DPI), "f.pdf"],
+                             cwd=td, check=True, capture_output=True).stdout
+    rasters = _ppm_pages(ppm)
+    assert len(rasters) == len(todo), \
+        f"pdftoppm wrote {len(rasters)} pages for {len(todo)} bodies"
+    for i, a in zip(todo, rasters):
+        out[i] = a
+        if keys[i] is not None:
+            _store(a, keys[i])
+    return out
+
+
+def render_array(body, w, h):
+    """Compile one TikZ body and return it as an H x W x 3 uint8 array, uncropped."""
+    return render_batch([(body, w, h)])[0]
+
+
+def render(body, w, h):
+    """Compile one TikZ body and return the RGB image, uncropped."""
+    return Image.fromarray(render_array(body, w, h))
 
 
 # --------------------------------------------------------------------------- calibration
 def _measure_ink_height(glyph):
     body = f"\\node[lab,anchor=base west] at (40,60) {{{glyph}}};\n"
-    a = np.array(render(body, 400, 200).convert("L"))
+    a = luma(render_array(body, 400, 200))
     ys, _ = np.where(a < 200)
     return (ys.max() - ys.min() + 1) / PXBP        # bp
 
@@ -153,17 +367,53 @@ def _measure_ink_height(glyph):
 _CAL = {}
 
 
+@functools.lru_cache(maxsize=None)
+def _lmodern():
+    """The date and version lmodern.sty declares, for the calibration key."""
+    path = subprocess.run(["kpsewhich", "lmodern.sty"],
+                          capture_output=True, text=True).stdout.strip()
+    if not path:
+        return ""
+    m = re.search(r"\\ProvidesPackage\{lmodern\}\s*\[([^\]]*)\]",
+                  Path(path).read_text(errors="replace"))
+    return m.group(1) if m else path
+
+
+def _calibration_key():
+    page = hashlib.sha256((PREAMBLE + PAGE).encode()).hexdigest()[:12]
+    return f"{_toolchain()} | lmodern {_lmodern()} | {FONT}pt | {DPI}dpi | page {page}"
+
+
 def calibrate():
     """Derive the x-height ratio by measuring a compiled glyph, not by quoting a constant.
 
     FIGURE_GUIDE, "Measure the render": a computed assertion can only restate the
     author's intention.  m02 asserted FONT * CAP_RATIO * scale -- three numbers it
     already knew -- and passed while every label in the deck was 17% under the floor.
+
+    The measurement is kept in CACHE/calibration.json under the TeX and lmodern versions,
+    FONT, DPI and the page template, and taken again only when one of those changes: a
+    one-figure build used to pay for two throwaway compiles before drawing anything.
+    It is still a measurement -- just not a fresh one every run.
     """
     if not _CAL:
-        _CAL["x"] = _measure_ink_height("x") / FONT
-        _CAL["X"] = _measure_ink_height("X") / FONT
+        path, key = CACHE / "calibration.json", _calibration_key()
+        try:
+            table = json.loads(path.read_text())
+        except (OSError, ValueError):
+            table = {}
+        if _cache_on and key in table:
+            _CAL.update(table[key])
+        else:
+            _CAL["x"] = _measure_ink_height("x") / FONT
+            _CAL["X"] = _measure_ink_height("X") / FONT
         assert 0.38 < _CAL["x"] < 0.50, f"measured x-height ratio {_CAL['x']:.3f} is implausible"
+        if _cache_on and key not in table:
+            table[key] = dict(_CAL)
+            CACHE.mkdir(exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(table, indent=1, sort_keys=True) + "\n")
+            os.replace(tmp, path)
         print(f"  calibration: x-height {_CAL['x']:.4f} em, cap height {_CAL['X']:.4f} em "
               f"-> {FONT}pt lands {FONT * _CAL['x']:.1f}px x-height at scale 1.0")
     return _CAL["x"]
@@ -171,11 +421,14 @@ def calibrate():
 
 # --------------------------------------------------------------------------- emit
 def crop_and_check(name, im, container, hmod):
-    """Crop the height to the ink and assert what the student will actually see."""
+    """Crop the height to the ink and assert what the student will actually see.
+
+    `im` is the RGB array `render_array` returns; the crop is a view of it.
+    """
     w = DESIGN[container]
-    a = np.array(im.convert("L"))
+    a = luma(im)
     exp_w = int(round(w * PXBP))
-    assert im.size[0] == exp_w, f"{name}: page is {im.size[0]}px wide, expected {exp_w}"
+    assert im.shape[1] == exp_w, f"{name}: page is {im.shape[1]}px wide, expected {exp_w}"
 
     ys, xs = np.where(a < 200)
     assert len(ys), f"{name}: blank figure"
@@ -189,9 +442,9 @@ def crop_and_check(name, im, container, hmod):
 
     lo = max(0, ys.min() - int(PAD * PXBP))
     hi = min(a.shape[0], ys.max() + int(PAD * PXBP))
-    im = im.crop((0, lo, im.size[0], hi))
+    im = im[lo:hi]
 
-    fw, fh = im.size
+    fh, fw = im.shape[:2]
     hcap = FIG_H[hmod]
     scale = min(CONTAINER[container] / fw, hcap / fh, 1.0)
     factor = scale * PXBP                       # slide px per bp
@@ -219,20 +472,118 @@ def emit(name, body, container="col", h=None, hmod=""):
     A generator that stops at the first failed assertion hides the rest, and these
     gates fire in clusters -- raising the type size broke seven of m03's figures at
     once. Every failure is printed and the run exits non-zero at the end.
+
+    Inside `batched()` the page is queued, and rendered with the others at its end.
     """
     if _only and not any(k in name for k in _only):
         return
     try:
         w = DESIGN[container]
-        im = render(body, w, h or int(w * 0.70))
-        im, fw, fh, node_px, x_px, span = crop_and_check(name, im, container, hmod)
-        im.save(OUT / f"{name}.png")
-        _built.append(name)
-        print(f"  {name}.png  {fw//4}x{fh//4}bp  node {node_px:.0f}px  x-h {x_px:.1f}px  "
-              f"ink {span:.0%}  [{container}{'/' + hmod if hmod else ''}]")
+        page = (body, w, h or int(w * 0.70))
+        stamp = _stamp(page, container, hmod)
+        if _unchanged(name, stamp):
+            _skipped.append(name)
+            print(f"  {name}.png  unchanged, skipped")
+            return
+        if _queue is not None:
+            _queue.append((name, page, container, hmod, stamp))
+            return
+        _finish(name, render_array(*page), container, hmod, stamp)
     except (AssertionError, SystemExit) as e:
-        _failures.append((name, str(e)))
-        print(f"  FAIL {name}: {e}")
+        _fail(name, e)
+
+
+def _finish(name, im, container, hmod, stamp):
+    im, fw, fh, node_px, x_px, span = crop_and_check(name, im, container, hmod)
+    Image.fromarray(im).save(OUT / f"{name}.png")
+    _stamps[name] = {"stamp": stamp, "png": _file_hash(OUT / f"{name}.png")}
+    _built.append(name)
+    print(f"  {name}.png  {fw//4}x{fh//4}bp  node {node_px:.0f}px  x-h {x_px:.1f}px  "
+          f"ink {span:.0%}  [{container}{'/' + hmod if hmod else ''}]")
+
+
+def _fail(name, e):
+    _failures.append((name, str(e)))
+    print(f"  FAIL {name}: {e}")
+
+
+_queue = None
+
+
+@contextlib.contextmanager
+def batched():
+    """Queue every `emit()` in the block and render them as one document when it ends.
+
+    A TeX error fails only the figure whose page caused it: that page is dropped and
+    the rest recompiled, so a batch reports exactly the failures the figures would
+    have reported one at a time.
+    """
+    global _queue
+    _queue = []
+    try:
+        yield
+        queue = _queue
+    finally:
+        _queue = None
+    while queue:
+        try:
+            ims = render_batch([q[1] for q in queue])
+        except TexError as e:
+            if e.page is None:          # the log named no page: go one at a time
+                ims = None
+            else:
+                _fail(queue.pop(e.page)[0], e)
+                continue
+        for i, (name, page, container, hmod, stamp) in enumerate(queue):
+            try:
+                _finish(name, ims[i] if ims else render_array(*page), container, hmod, stamp)
+            except (AssertionError, SystemExit) as e:
+                _fail(name, e)
+        break
+
+
+# --------------------------------------------------------------------------- manifest
+# A one-line label edit used to rebuild all 55 figures. Every figure function still
+# runs -- that is where the planarity, clearance and label gates live, and they are
+# cheap -- but a figure whose page is unchanged since its PNG was last written is not
+# rendered, cropped or saved again. The stamp covers the page's TeX, its container, the
+# toolchain and this file, which holds every render gate; the PNG's own hash catches a
+# file overwritten since. `--force` rebuilds everything.
+MANIFEST = CACHE / "manifest.json"
+_force = "--force" in sys.argv
+_manifest = {}          # name -> {"stamp", "png"} as of the last run; run() loads it
+_stamps = {}            # what this process wrote, for run() to fold back in
+_skipped = []
+
+
+@functools.lru_cache(maxsize=None)
+def _gates():
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def _stamp(page, container, hmod):
+    src = f"{_gates()}\n{_toolchain()}\n{container}/{hmod}\n{_tex([page])}"
+    return hashlib.sha256(src.encode()).hexdigest()
+
+
+def _file_hash(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _unchanged(name, stamp):
+    rec, png = _manifest.get(name), OUT / f"{name}.png"
+    return (not _force and rec is not None and rec["stamp"] == stamp and png.exists()
+            and rec["png"] == _file_hash(png))
+
+
+def _save_manifest():
+    _manifest.update(_stamps)
+    for n, _ in _failures:
+        _manifest.pop(n, None)
+    CACHE.mkdir(exist_ok=True)
+    tmp = MANIFEST.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(_manifest, indent=1, sort_keys=True) + "\n")
+    os.replace(tmp, MANIFEST)
 
 
 # --------------------------------------------------------------------------- drawing
@@ -330,17 +681,55 @@ def pct(x, d=0):
 
 
 # --------------------------------------------------------------------------- geometry gates
+def _cells(b, cell):
+    """The grid cells an axis-aligned box touches."""
+    for gx in range(math.floor(b[0] / cell), math.floor(b[2] / cell) + 1):
+        for gy in range(math.floor(b[1] / cell), math.floor(b[3] / cell) + 1):
+            yield gx, gy
+
+
+def _bucket(boxes, cell):
+    """A uniform-grid spatial index: cell -> indices of the boxes that touch it."""
+    grid = collections.defaultdict(list)
+    for i, b in enumerate(boxes):
+        for c in _cells(b, cell):
+            grid[c].append(i)
+    return grid
+
+
+def _near(grid, b, cell):
+    """Indices of every bucketed box that shares a cell with `b`, each once, in order."""
+    return sorted({i for c in _cells(b, cell) for i in grid.get(c, ())})
+
+
+def _extent(edges, pos):
+    """Per-edge bounding boxes, and a grid cell about one typical edge across."""
+    boxes = [(min(pos[a][0], pos[b][0]), min(pos[a][1], pos[b][1]),
+              max(pos[a][0], pos[b][0]), max(pos[a][1], pos[b][1])) for a, b in edges]
+    span = sorted(max(x1 - x0, y1 - y0) for x0, y0, x1, y1 in boxes)
+    return boxes, max(span[len(span) // 2] if span else 0, NODE)
+
+
 def clearance_bad(edges, pos, r=NODE / 2 + 3):
-    """No straight edge may pass through a disc it does not end at."""
+    """No straight edge may pass through a disc it does not end at.
+
+    Only the discs bucketed within `r` of an edge's bounding box are measured, in
+    `pos` order, with the same arithmetic as ever, so the list is unchanged.
+    """
     bad = []
-    for a, b in edges:
+    edges = list(edges)
+    boxes, cell = _extent(edges, pos)
+    names = list(pos)
+    grid = _bucket([(x, y, x, y) for x, y in pos.values()], cell)
+    for (a, b), (x0, y0, x1, y1) in zip(edges, boxes):
         pa, pb = np.array(pos[a], float), np.array(pos[b], float)
         d = pb - pa
         L2 = float(d @ d)
-        for n, p in pos.items():
+        for i in _near(grid, (x0 - r, y0 - r, x1 + r, y1 + r), cell):
+            n = names[i]
             if n in (a, b):
                 continue
-            p = np.array(p, float)
+            p = np.array(pos[n], float)
             t = max(0.0, min(1.0, float((p - pa) @ d) / L2))
             if np.linalg.norm(pa + t * d - p) < r:
                 bad.append((a, b, n))
@@ -355,9 +744,23 @@ def _seg_cross(p1, p2, p3, p4):
 
 
 def crossings(edges, pos):
-    """F2 as a build gate: no two non-adjacent edges may cross."""
-    return [((a, b), (c, d)) for (a, b), (c, d) in itertools.combinations(edges, 2)
-            if len({a, b, c, d}) == 4 and _seg_cross(pos[a], pos[b], pos[c], pos[d])]
+    """F2 as a build gate: no two non-adjacent edges may cross.
+
+    Two segments can only cross if their bounding boxes meet, so only edges that share
+    a grid cell are tested; the pairs come back in `itertools.combinations` order.
+    """
+    edges = list(edges)
+    boxes, cell = _extent(edges, pos)
+    grid = _bucket(boxes, cell)
+    pairs = sorted({(i, j) for ids in grid.values() for i, j in itertools.combinations(ids, 2)
+                    if not (boxes[i][2] < boxes[j][0] or boxes[j][2] < boxes[i][0]
+                            or boxes[i][3] < boxes[j][1] or boxes[j][3] < boxes[i][1])})
+    out = []
+    for i, j in pairs:
+        (a, b), (c, d) = edges[i], edges[j]
+        if len({a, b, c, d}) == 4 and _seg_cross(pos[a], pos[b], pos[c], pos[d]):
+            out.append(((a, b), (c, d)))
+    return out
 
 
 def assert_planar_drawing(edges, pos, what):
@@ -430,46 +833,91 @@ def place_labels(names, pos, edges, blockers=(), bounds=None, gap=0.0, size=FONT
     Checked against every other label, every disc **including the label's own**, every
     drawn edge, any extra blocker boxes, and the canvas bounds.  Backtracking, best
     side first, so the usual answer is also the tidy one.
+
+    It used to test each candidate against every disc, edge and placed box inside the
+    search, which is fine for thirteen names and hopeless for the karate club. Now every
+    candidate box is built and tested against the fixed scene ONCE, through a grid
+    index, and the clashes between candidates of different labels become a conflict
+    graph. The search is the same -- same label order, same side order -- with forward
+    checking: placing a label strikes its conflicts from the labels still to come, and
+    a label left with no side fails the branch at once instead of at the bottom of it.
+    Pruning only ever removes branches that hold no solution, so the first answer found
+    is the one the plain backtracker found.
     """
     order = sorted(names, key=lambda n: -len(names[n]))
-    chosen, boxes = {}, {}
-
-    def ok(n, side):
-        anc, dx, dy = side
-        b = label_box(pos[n][0] + dx, pos[n][1] + dy, names[n], anc, size=size)
-        b = (b[0] - gap, b[1] - gap, b[2] + gap, b[3] + gap)
+    raw = []                         # (label index, side index, side, box)
+    for li, n in enumerate(order):
+        for k, side in enumerate(SIDES):
+            anc, dx, dy = side
+            b = label_box(pos[n][0] + dx, pos[n][1] + dy, names[n], anc, size=size)
+            raw.append((li, k, side, (b[0] - gap, b[1] - gap, b[2] + gap, b[3] + gap)))
+    # No smaller than the biggest box, so any box touches at most four cells.
+    cell = max([max(b[2] - b[0], b[3] - b[1]) for *_, b in raw] + [NODE]) + 1
+
+    centres = list(pos.values())
+    segs = [(pos[a], pos[c]) for a, c in edges]
+    blockers = list(blockers)
+    disc_ix = _bucket([(x, y, x, y) for x, y in centres], cell)
+    seg_ix = _bucket([(min(p[0], q[0]), min(p[1], q[1]), max(p[0], q[0]), max(p[1], q[1]))
+                      for p, q in segs], cell)
+    blk_ix = _bucket(blockers, cell)
+
+    def fits(b):
         if bounds and not (bounds[0] <= b[0] and b[2] <= bounds[2]
                            and bounds[1] <= b[1] and b[3] <= bounds[3]):
-            return None
-        if any(box_hits_disc(b, x, y) for x, y in pos.values()):
-            return None
-        if any(boxes_overlap(b, o) for o in boxes.values()):
-            return None
-        if any(boxes_overlap(b, o) for o in blockers):
-            return None
-        if any(box_hits_segment(b, pos[a], pos[c]) for a, c in edges):
-            return None
-        return b
+            return False
+        # A disc can only be hit from within one diameter; box_hits_segment pads by 4bp.
+        near = (b[0] - NODE, b[1] - NODE, b[2] + NODE, b[3] + NODE)
+        if any(box_hits_disc(b, *centres[i]) for i in _near(disc_ix, near, cell)):
+            return False
+        if any(boxes_overlap(b, blockers[i]) for i in _near(blk_ix, b, cell)):
+            return False
+        near = (b[0] - 4, b[1] - 4, b[2] + 4, b[3] + 4)
+        return not any(box_hits_segment(b, *segs[i]) for i in _near(seg_ix, near, cell))
+
+    cands = [c for c in raw if fits(c[3])]
+    live = [set() for _ in order]
+    for ci, c in enumerate(cands):
+        live[c[0]].add(ci)
+    stuck = [order[li] for li in range(len(order)) if not live[li]]
+    if stuck:
+        raise SystemExit(
+            "label placement failed -- no collision-free side assignment exists.\n"
+            f"No side of {stuck[0]!r} clears the discs, edges and bounds on its own.\n"
+            "Move a node, shorten a name, or widen the canvas; do not shrink the type.")
+
+    cand_ix = _bucket([c[3] for c in cands], cell)
+    clash = [[j for j in _near(cand_ix, c[3], cell)
+              if cands[j][0] != c[0] and boxes_overlap(c[3], cands[j][3])] for c in cands]
+    chosen = [None] * len(order)
 
-    def solve(i):
-        if i == len(order):
+    def solve(li):
+        if li == len(order):
             return True
-        n = order[i]
-        for side in SIDES:
-            b = ok(n, side)
-            if b is None:
-                continue
-            chosen[n], boxes[n] = side, b
-            if solve(i + 1):
-                return True
-            del chosen[n], boxes[n]
+        for ci in sorted(live[li]):
+            struck, dead = [], False
+            for j in clash[ci]:
+                lj = cands[j][0]
+                if lj > li and j in live[lj]:
+                    live[lj].discard(j)
+                    struck.append(j)
+                    if not live[lj]:
+                        dead = True
+                        break
+            if not dead:
+                chosen[li] = ci
+                if solve(li + 1):
+                    return True
+            for j in struck:
+                live[cands[j][0]].add(j)
         return False
 
     if not solve(0):
         raise SystemExit(
             "label placement failed -- no collision-free side assignment exists.\n"
             "Move a node, shorten a name, or widen the canvas; do not shrink the type.")
-    return chosen, boxes
+    return ({order[li]: cands[ci][2] for li, ci in enumerate(chosen)},
+            {order[li]: cands[ci][3] for li, ci in enumerate(chosen)})
 
 
 def draw_labels(names, pos, chosen, color="black", size=FONT):
@@ -601,20 +1049,91 @@ class Axes:
 
 
 # --------------------------------------------------------------------------- run
+def _cli(argv):
+    """Name filters and a job count out of argv: `-j 8`, `-j8`, `--jobs=8`, or `-j` alone
+    for one job per core. Anything else starting with a dash is left to the caller."""
+    only, jobs, args = [], 1, list(argv)
+    while args:
+        a = args.pop(0)
+        if a in ("-j", "--jobs"):
+            jobs = int(args.pop(0)) if args and args[0].isdigit() else os.cpu_count()
+        elif a.startswith("--jobs="):
+            jobs = int(a[len("--jobs="):])
+        elif a.startswith("-j") and a[2:].isdigit():
+            jobs = int(a[2:])
+        elif not a.startswith("-"):
+            only.append(a)
+    return only, max(1, jobs or 1)
+
+
+def _attempt(name, fn):
+    try:
+        fn()
+    except (AssertionError, SystemExit) as e:
+        _fail(name, e)
+
+
+_pool_figures = ()
+
+
+def _attempt_in_worker(chunk):
+    """A run of figures in a pool worker: hand back what it printed, built and failed.
+
+    Their pages are compiled as one batch. The worker's own `_built`/`_failures` start
+    empty, so the parent can fold them into the one report in run order.
+    """
+    del _built[:], _failures[:], _skipped[:]
+    _stamps.clear()
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf), batched():
+        for name, fn in _pool_figures[chunk]:
+            _attempt(name, fn)
+    return buf.getvalue(), list(_built), list(_failures), list(_skipped), dict(_stamps)
+
+
 def run(figures):
-    """Build every figure, report every failure, exit non-zero if any failed."""
-    global _only
-    _only = [a for a in sys.argv[1:] if not a.startswith("-")]
+    """Build every figure, report every failure, exit non-zero if any failed.
+
+    `-j N` builds N figures at a time. Each figure is one pdflatex + pdftoppm pair that
+    waits on a single core, so a deck's build time was TeX latency times the figure
+    count. Workers are forked rather than spawned: FIGURES holds closures, which do not
+    pickle, and a fork also inherits the calibration, so each worker is handed a slice
+    of the list -- a few consecutive figures, compiled as one document (`batched()`).
+    A figure writes the same PNG whichever process or batch draws it, so the output is
+    byte-identical to a serial build; only the wall time and the order of log lines
+    inside one slice change.
+
+    Figures unchanged since the last run are reported and skipped (see MANIFEST).
+    """
+    global _only, _pool_figures
+    _only, jobs = _cli(sys.argv[1:])
+    _format()                           # once, here, rather than once per worker
     calibrate()
-    for name, fn in figures:
-        if _only and not any(k in name for k in _only):
-            continue
-        try:
-            fn()
-        except (AssertionError, SystemExit) as e:
-            _failures.append((name, str(e)))
-            print(f"  FAIL {name}: {e}")
-    print(f"\n{len(_built)} figures written, {len(_failures)} failed")
+    try:
+        _manifest.update(json.loads(MANIFEST.read_text()))
+    except (OSError, ValueError):
+        pass
+    todo = [(name, fn) for name, fn in figures
+            if not _only or any(k in name for k in _only)]
+    if jobs > 1 and len(todo) > 1 and "fork" in multiprocessing.get_all_start_methods():
+        _pool_figures = todo
+        sys.stdout.flush()              # or every child replays the parent's buffer
+        ctx = multiprocessing.get_context("fork")
+        size = math.ceil(len(todo) / (4 * jobs))          # ~4 slices a worker, to balance
+        chunks = [slice(i, i + size) for i in range(0, len(todo), size)]
+        with ProcessPoolExecutor(min(jobs, len(chunks)), mp_context=ctx) as pool:
+            for out, built, failed, skipped, stamps in pool.map(_attempt_in_worker, chunks):
+                sys.stdout.write(out)
+                _built.extend(built)
+                _failures.extend(failed)
+                _skipped.extend(skipped)
+                _stamps.update(stamps)
+    else:
+        for name, fn in todo:
+            _attempt(name, fn)
+    _save_manifest()
+    print(f"\n{len(_built)} figures written, {len(_skipped)} unchanged, "
+          f"{len(_failures)} failed")
     if _failures:
         for n, e in _failures:
             print(f"  ! {n}: {e.splitlines()[0]}")
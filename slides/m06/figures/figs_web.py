@@ -764,7 +764,7 @@ def fig_purpose(step):
     F.emit(f"purpose-{step}", body, container="full", h=CANVAS_H)
 
 
-# crown_robustness() enumerates 4992 map variants and takes about a minute, so the
+# crown_robustness() enumerates 4992 map variants and still takes seconds, so the
 # figure quotes the numbers and re-derives them only when asked. Set M06_FULL_CHECK=1
 # to make the build call it and check every row against this table.
 ROBUST_N = 4992
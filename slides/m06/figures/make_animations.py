@@ -15,7 +15,10 @@ intended -- the loop has to hand off to the slide that follows it.
     python3 figures/make_animations.py
 """
 
+import itertools
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import numpy as np
@@ -27,33 +30,53 @@ import figlib as F                                          # noqa: E402
 import romelib as R                                         # noqa: E402
 from figlib import (CONTAINER, DESIGN, FIG_H, FONT, INK_FILL_MIN, NODE,  # noqa: E402
                     NODE_MAX_PX, NODE_MIN_PX, OUT, PAD, PXBP, TEXT_MIN_PX,
-                    calibrate, render)
+                    calibrate, luma, render_batch)
 from verify_numbers import (POWER_SHOW, POWER_TRACE, ROMA, ROMA_C,  # noqa: E402
                             ROMA_CROWNS)
 
 HOLD = 6            # frames of pause on the settled state
 MS = 700            # ms per frame
 
-_only = sys.argv[1:]
+_only = [a for a in sys.argv[1:] if not a.startswith("-")]
 _built = []
 _failures = []
 
 
+def _render_frames(pages):
+    """render_batch over `pages`, split into one run per core and compiled side by side.
+
+    The work is pdflatex and pdftoppm in child processes, so plain threads are enough.
+    """
+    n = min(os.cpu_count() or 1, len(pages))
+    if n <= 1:
+        return render_batch(pages)
+    size = -(-len(pages) // n)
+    runs = [pages[i:i + size] for i in range(0, len(pages), size)]
+    with ThreadPoolExecutor(len(runs)) as ex:
+        return [im for ims in ex.map(render_batch, runs) for im in ims]
+
+
 def emit_gif(name, frames, container="full", h=None, hmod="", hold=HOLD, ms=MS):
     """Render every frame, crop them all to ONE box, and assert the same floors.
 
     Cropping each frame to its own ink would make the drawing jump between frames,
     which reads as a fault in the projector rather than as a build.
+
+    Only distinct bodies are drawn, each once, and the runs of them go to pdflatex
+    side by side. A run of identical frames -- the hold, or a state the animation sits
+    in -- is written as ONE frame that stays up for the whole run.
     """
     if _only and not any(k in name for k in _only):
         return
     w = DESIGN[container]
     hmax = h or int(w * 0.70)
-    ims = [render(body, w, hmax) for body in frames]
+    frames = list(frames)
+    uniq = list(dict.fromkeys(frames))
+    ims = _render_frames([(body, w, hmax) for body in uniq])
 
     box = None
     for im in ims:
-        a = np.array(im.convert("L"))
+        a = luma(im)
         ys, xs = np.where(a < 200)
         assert len(ys), f"{name}: a frame is blank"
         b = (xs.min(), ys.min(), xs.max(), ys.max())
@@ -61,16 +84,16 @@ def emit_gif(name, frames, container="full", h=None, hmod="", hold=HOLD, ms=MS):
                                      max(box[2], b[2]), max(box[3], b[3]))
     edge = 2
     assert not (box[0] <= edge or box[1] <= edge
-                or box[2] >= ims[0].size[0] - 1 - edge
-                or box[3] >= ims[0].size[1] - 1 - edge), (
+                or box[2] >= ims[0].shape[1] - 1 - edge
+                or box[3] >= ims[0].shape[0] - 1 - edge), (
         f"{name}: ink runs off the canvas in some frame -- it is being CLIPPED")
 
     pad = int(PAD * PXBP)
     lo = max(0, box[1] - pad)
-    hi = min(ims[0].size[1], box[3] + pad)
-    ims = [im.crop((0, lo, im.size[0], hi)) for im in ims]
+    hi = min(ims[0].shape[0], box[3] + pad)
+    ims = [im[lo:hi] for im in ims]
 
-    fw, fh = ims[0].size
+    fh, fw = ims[0].shape[:2]
     hcap = FIG_H[hmod]
     scale = min(CONTAINER[container] / fw, hcap / fh, 1.0)
     factor = scale * PXBP
@@ -85,12 +108,13 @@ def emit_gif(name, frames, container="full", h=None, hmod="", hold=HOLD, ms=MS):
     x_px = FONT * calibrate() * factor
     assert x_px >= TEXT_MIN_PX, f"{name}: text x-height {x_px:.1f}px on the slide"
 
-    seq = ims + [ims[-1]] * hold
-    pal = [im.convert("P", palette=Image.ADAPTIVE) for im in seq]
+    seq = [uniq.index(body) for body in frames] + [uniq.index(frames[-1])] * hold
+    runs = [(i, len(list(g))) for i, g in itertools.groupby(seq)]
+    pal = [Image.fromarray(ims[i]).convert("P", palette=Image.ADAPTIVE) for i, _ in runs]
     pal[0].save(OUT / f"{name}.gif", save_all=True, append_images=pal[1:],
-                duration=ms, loop=0, optimize=True, disposal=2)
+                duration=[ms * n for _, n in runs], loop=0, optimize=True, disposal=2)
     _built.append(name)
-    print(f"  {name}.gif  {len(seq)} frames  {fw // 4}x{fh // 4}bp  "
+    print(f"  {name}.gif  {len(seq)} frames ({len(runs)} stored)  {fw // 4}x{fh // 4}bp  "
           f"node {node_px:.0f}px  x-h {x_px:.1f}px  ink {span:.0%}")
 
 
@@ -131,6 +155,7 @@ def power_frames():
 
 
 def main():
+    F._format()                         # once, before the frame threads want it
     calibrate()
     for name, fn, kw in [("power-iteration", power_frames,
                           dict(container="full", h=470, hmod="tall"))]:
@@ -3,6 +3,8 @@
 
     python3 figures/make_figures.py            # all of them
     python3 figures/make_figures.py roma       # only figures whose name contains "roma"
+    python3 figures/make_figures.py -j 8       # eight figures at a time, same output
+    python3 figures/make_figures.py --force    # redraw even the unchanged ones
 
 The pipeline and every gate live in `figlib.py`; every number lives in
 `verify_numbers.py`; the one Roman-map geometry that all seven metric figures share
@@ -15,6 +17,13 @@ in parallel:
     figs_web.py     Parts 7-8   the directed web, and the closing figures
     figs_extra.py   three column-width figures the slides needed once written
 
+Only figures whose drawing changed are redrawn. Every figure function runs on every
+build -- a figure's inputs are `figlib`, `romelib` and the constants in
+`verify_numbers`, and the TikZ body it emits is the one place they all meet -- and
+`figlib.emit()` skips any figure whose body, canvas and gates match the manifest entry
+for the PNG already on disk. So a one-line label edit redraws one PNG, and the log says
+which were skipped.
+
 Nothing here stops at the first failure: `figlib.run()` catches per figure, prints
 every failure and exits non-zero at the end. These gates fire in clusters -- raising
 the type size broke seven of m03's figures at once -- and stopping at figure 3 of 55
@@ -39,11 +39,90 @@ Part 7, where the page HITS crowns as the best hub is the page PageRank ranks
 last of eight.
 """
 
+import collections
+import hashlib
+import inspect
 import itertools
+import os
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
 
 import networkx as nx
 import numpy as np
+import scipy
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+# =============================================================================
+# 0. Facts: every computed number is made on first use, then kept
+# =============================================================================
+# Importing this module used to compute every graph, score, curve and check in it,
+# so a figure that wanted ROMA paid for the web, the attack curves and the redraw.
+# Now each computed constant is registered with the function that makes it (`fact`),
+# and is made the first time anyone reads it -- `from verify_numbers import ROMA`
+# included, through the module's __getattr__. A maker names the facts it needs as its
+# parameters, so asking for one fact makes exactly it and what it depends on, and
+# its asserts run every time it does.
+#
+# What a maker returns is pickled into CACHE under a hash of this file, so the next
+# process with the same source loads values that have already passed their asserts.
+# Literal data (positions, edge lists, the graphs built straight from them) and the
+# functions stay plain module constants.
+CACHE = Path(__file__).resolve().parent / ".cache"
+_cache_on = "--no-cache" not in sys.argv
+_SOURCE = hashlib.sha256(Path(__file__).read_bytes()
+                         + f"numpy {np.__version__} networkx {nx.__version__} "
+                           f"scipy {scipy.__version__}".encode()
+                         ).hexdigest()[:16]
+_MAKERS = {}                    # fact name -> (maker, every name that maker returns)
+
+
+def fact(*names):
+    """Register the decorated function as the maker of the module constants `names`.
+
+    It returns their values in that order (a lone value for a lone name).
+    """
+    def register(fn):
+        for n in names:
+            _MAKERS[n] = (fn, names)
+        return fn
+    return register
+
+
+def _make(fn, names):
+    key = CACHE / f"facts-{_SOURCE}" / f"{fn.__name__}.pkl"
+    try:
+        vals = pickle.loads(key.read_bytes()) if _cache_on else None
+    except (OSError, pickle.UnpicklingError, EOFError):
+        vals = None
+    if vals is None:
+        vals = fn(*[__getattr__(p) for p in inspect.signature(fn).parameters])
+        vals = (vals,) if len(names) == 1 else tuple(vals)
+        if _cache_on:
+            key.parent.mkdir(parents=True, exist_ok=True)
+            tmp = key.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(pickle.dumps(vals))
+            os.replace(tmp, key)
+    globals().update(zip(names, vals))
+
+
+def __getattr__(name):
+    if name in globals():
+        return globals()[name]
+    if name not in _MAKERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    _make(*_MAKERS[name])
+    return globals()[name]
+
+
+def make_all():
+    """Every registered fact, made (or loaded) and bound as a module constant."""
+    for name in _MAKERS:
+        __getattr__(name)
+
 
 # =============================================================================
 # 1. The Roman road network -- the deck's working graph
@@ -112,32 +191,95 @@ def eigen_leading(A):
     return float(w[-1]), v / v.max()
 
 
+_DENSE_MAX = 256            # below this LAPACK on the dense matrix beats ARPACK
+
+
+def _sweep(indptr, indices):
+    """One BFS per source over a CSR graph: distance sums and Brandes' betweenness.
+
+    Returns per node the number of others it reaches, the sum of their distances, the
+    sum of their inverse distances, the largest distance, and the unnormalized
+    betweenness, all from the same traversal.
+    """
+    n = len(indptr) - 1
+    reach, total, inv, far = [0] * n, [0] * n, [0.0] * n, [0] * n
+    bt = [0.0] * n
+    for s in range(n):
+        dist, sigma = [-1] * n, [0] * n
+        dist[s], sigma[s] = 0, 1
+        order, head = [s], 0
+        while head < len(order):
+            v = order[head]
+            head += 1
+            for w in indices[indptr[v]:indptr[v + 1]]:
+                if dist[w] < 0:
+                    dist[w] = dist[v] + 1
+                    order.append(w)
+                if dist[w] == dist[v] + 1:
+                    sigma[w] += sigma[v]
+        delta = [0.0] * n
+        for w in reversed(order):
+            coeff = (1 + delta[w]) / sigma[w]
+            for v in indices[indptr[w]:indptr[w + 1]]:
+                if dist[v] == dist[w] - 1:
+                    delta[v] += sigma[v] * coeff
+            if w != s:
+                bt[w] += delta[w]
+        reach[s] = len(order) - 1
+        total[s] = sum(dist[j] for j in order)
+        inv[s] = sum(1.0 / dist[j] for j in range(n) if dist[j] > 0)
+        far[s] = dist[order[-1]]
+    return reach, total, inv, far, bt
+
+
+def centrality_arrays(A, katz_ratio=KATZ_SAFE, metrics=None):
+    """All seven METRICS for the graph with symmetric CSR adjacency `A`, in row order.
+
+    Closeness, harmonic, eccentricity and betweenness share one BFS sweep per source
+    (`_sweep`); eigenvector and Katz go to ARPACK and a sparse solve once the graph is
+    too big for the dense ones. Pass `metrics` to compute only those: an attack that
+    ranks by degree never needs the sweep or the spectrum.
+    """
+    A = sp.csr_array(A, dtype=float)
+    n = A.shape[0]
+    want = set(METRICS if metrics is None else metrics)
+    out = {}
+    if want & {"eigenvector", "katz"}:
+        if n <= _DENSE_MAX:
+            lmax, vec = eigen_leading(A.toarray())
+        else:
+            w, V = spla.eigsh(A, k=1, which="LA")
+            lmax, vec = float(w[0]), np.abs(V[:, 0])
+            vec = vec / vec.max()
+        lam = katz_ratio / lmax
+        if n <= _DENSE_MAX:
+            katz = np.linalg.solve(np.eye(n) - lam * A.toarray(), np.ones(n))
+        else:
+            katz = spla.spsolve(sp.csc_array(sp.eye_array(n) - lam * A), np.ones(n))
+        out.update(eigenvector=vec, katz=katz / katz.max(), _lambda_max=lmax,
+                   _katz_lambda=lam)
+    if want & {"closeness", "harmonic", "eccentricity", "betweenness"}:
+        reach, total, inv, far, bt = _sweep(A.indptr.tolist(), A.indices.tolist())
+        whole = np.array(reach) == n - 1
+        # networkx's normalization for an undirected graph: ordered pairs over (n-1)(n-2).
+        scale = 1 / ((n - 1) * (n - 2)) if n > 2 else 1.0
+        out.update(closeness=np.where(whole, (n - 1) / np.maximum(total, 1), 0.0),
+                   harmonic=np.array(inv),
+                   eccentricity=np.where(whole, 1.0 / np.maximum(far, 1), 0.0),
+                   betweenness=np.array(bt) * scale)
+    out["degree"] = np.diff(A.indptr).astype(float)
+    return out
+
+
 def centralities(G, katz_ratio=KATZ_SAFE):
+    """The seven METRICS of G as {metric: {node: score}}; the arrays under "_arrays"."""
     names = list(G)
-    A = nx.to_numpy_array(G, nodelist=names)
-    n = len(names)
-    lmax, vec = eigen_leading(A)
-    lam = katz_ratio / lmax
-    katz = np.linalg.solve(np.eye(n) - lam * A, np.ones(n))
-    d = dict(nx.all_pairs_shortest_path_length(G))
-    closeness, harmonic, ecc = {}, {}, {}
-    for i in names:
-        others = [d[i][j] for j in names if j != i and j in d[i]]
-        reach = len(others)
-        closeness[i] = (n - 1) / sum(others) if reach == n - 1 else 0.0
-        harmonic[i] = sum(1.0 / x for x in others)
-        ecc[i] = 1.0 / max(others) if reach == n - 1 else 0.0
-    return {
-        "degree": {k: float(v) for k, v in G.degree()},
-        "closeness": closeness,
-        "harmonic": harmonic,
-        "eccentricity": ecc,
-        "betweenness": nx.betweenness_centrality(G, normalized=True),
-        "eigenvector": dict(zip(names, vec)),
-        "katz": dict(zip(names, katz / katz.max())),
-        "_lambda_max": lmax,
-        "_katz_lambda": lam,
-    }
+    arr = centrality_arrays(nx.to_scipy_sparse_array(G, nodelist=names, format="csr"),
+                            katz_ratio)
+    out = {m: dict(zip(names, arr[m].tolist())) for m in METRICS}
+    out.update(_lambda_max=arr["_lambda_max"], _katz_lambda=arr["_katz_lambda"],
+               _arrays=arr)
+    return out
 
 
 METRICS = ["degree", "closeness", "harmonic", "eccentricity",
@@ -154,86 +296,110 @@ def podium(scores, k=3):
     return [(n, scores[n]) for n in sorted(scores, key=lambda n: (-scores[n], n))[:k]]
 
 
-ROMA = roma_graph()
-ROMA_C = centralities(ROMA)
-ROMA_CROWNS = {m: crown(ROMA_C[m]) for m in METRICS}
-
-# ---- the facts the deck states about this graph ----------------------------
-assert ROMA.number_of_nodes() == 12 and ROMA.number_of_edges() == 18
-assert nx.is_connected(ROMA)
-assert nx.diameter(ROMA) == 5
-assert dict(ROMA.degree())["Roma"] == 5, "Rome has five roads on this map"
-assert dict(ROMA.degree())["Londinium"] == 1
-assert list(nx.bridges(ROMA)) == [CUT_EDGE] or list(nx.bridges(ROMA)) == [CUT_EDGE[::-1]]
+@fact("ROMA")
+def _roma():
+    ROMA = roma_graph()
+    # ---- the facts the deck states about this graph ----------------------------
+    assert ROMA.number_of_nodes() == 12 and ROMA.number_of_edges() == 18
+    assert nx.is_connected(ROMA)
+    assert nx.diameter(ROMA) == 5
+    assert dict(ROMA.degree())["Roma"] == 5, "Rome has five roads on this map"
+    assert dict(ROMA.degree())["Londinium"] == 1
+    assert list(nx.bridges(ROMA)) == [CUT_EDGE] or list(nx.bridges(ROMA)) == [CUT_EDGE[::-1]]
+    return ROMA
+
+
+@fact("ROMA_C", "ROMA_CROWNS", "EIG_GAP_PCT", "DEG_GAP")
+def _roma_c(ROMA):
+    ROMA_C = centralities(ROMA)
+    ROMA_CROWNS = {m: crown(ROMA_C[m]) for m in METRICS}
+
+    # Rome takes every crown outright except the worst case, which it can only share.
+    for m in ["degree", "closeness", "harmonic", "betweenness", "eigenvector", "katz"]:
+        assert ROMA_CROWNS[m] == ["Roma"], (m, ROMA_CROWNS[m])
+    assert ROMA_CROWNS["eccentricity"] == ["Massilia", "Mediolanum", "Roma"], \
+        ROMA_CROWNS["eccentricity"]
+
+    # The two runner-up facts the deck names out loud.
+    assert podium(ROMA_C["degree"])[1][0] == "Alexandria"
+    assert podium(ROMA_C["betweenness"])[1][0] == "Mediolanum", \
+        "the betweenness runner-up is the deck's broker beat"
+    assert ROMA.degree("Mediolanum") == 3 < ROMA.degree("Alexandria") == 4, \
+        "Mediolanum brokers with fewer roads than Alexandria"
+    assert podium(ROMA_C["eigenvector"])[1][0] == "Alexandria"
+
+    # Alexandria closes to within a tenth of Rome on eigenvector while holding one
+    # road fewer -- the slide says "within 8%", so check the number, not the words.
+    alex_gap = float(1 - ROMA_C["eigenvector"]["Alexandria"] / ROMA_C["eigenvector"]["Roma"])
+    assert 0.05 < alex_gap < 0.10, alex_gap
+    EIG_GAP_PCT = int(Decimal(repr(alex_gap * 100)).quantize(Decimal("1"), ROUND_HALF_UP))
+
+    # ...but on plain degree the same city is a full road behind.
+    DEG_GAP = ROMA_C["degree"]["Roma"] - ROMA_C["degree"]["Alexandria"]
+    assert DEG_GAP == 1
+    return ROMA_C, ROMA_CROWNS, EIG_GAP_PCT, DEG_GAP
 
-# Rome takes every crown outright except the worst case, which it can only share.
-for m in ["degree", "closeness", "harmonic", "betweenness", "eigenvector", "katz"]:
-    assert ROMA_CROWNS[m] == ["Roma"], (m, ROMA_CROWNS[m])
-assert ROMA_CROWNS["eccentricity"] == ["Massilia", "Mediolanum", "Roma"], \
-    ROMA_CROWNS["eccentricity"]
-
-# The two runner-up facts the deck names out loud.
-assert podium(ROMA_C["degree"])[1][0] == "Alexandria"
-assert podium(ROMA_C["betweenness"])[1][0] == "Mediolanum", \
-    "the betweenness runner-up is the deck's broker beat"
-assert ROMA.degree("Mediolanum") == 3 < ROMA.degree("Alexandria") == 4, \
-    "Mediolanum brokers with fewer roads than Alexandria"
-assert podium(ROMA_C["eigenvector"])[1][0] == "Alexandria"
-
-# Alexandria closes to within a tenth of Rome on eigenvector while holding one
-# road fewer -- the slide says "within 8%", so check the number, not the words.
-_alex_gap = float(1 - ROMA_C["eigenvector"]["Alexandria"] / ROMA_C["eigenvector"]["Roma"])
-assert 0.05 < _alex_gap < 0.10, _alex_gap
-EIG_GAP_PCT = int(Decimal(repr(_alex_gap * 100)).quantize(Decimal("1"), ROUND_HALF_UP))
-
-# ...but on plain degree the same city is a full road behind.
-DEG_GAP = ROMA_C["degree"]["Roma"] - ROMA_C["degree"]["Alexandria"]
-assert DEG_GAP == 1
 
 # =============================================================================
 # 3. Cutting the Channel: closeness dies, harmonic survives  (c05, c06)
 # =============================================================================
-ROMA_CUT = roma_graph()
-ROMA_CUT.remove_edge(*CUT_EDGE)
-CUT_C = centralities(ROMA_CUT)
-
-assert not nx.is_connected(ROMA_CUT)
-assert nx.number_connected_components(ROMA_CUT) == 2
-assert sorted(nx.connected_components(ROMA_CUT), key=len)[0] == {"Londinium"}
-# Every closeness score collapses to zero -- not just Londinium's.
-assert all(v == 0.0 for v in CUT_C["closeness"].values()), \
-    "one unreachable node zeroes the whole ranking"
-assert len(set(CUT_C["closeness"].values())) == 1
-# Harmonic keeps ranking, and keeps the same king.
-assert crown(CUT_C["harmonic"]) == ["Roma"], crown(CUT_C["harmonic"])
-assert CUT_C["harmonic"]["Londinium"] == 0.0, "an island scores zero, everyone else does not"
-HARMONIC_CUT_LEVELS = len(set(round(v, 6) for v in CUT_C["harmonic"].values()))
-assert HARMONIC_CUT_LEVELS >= 8, \
-    ("harmonic must still separate the cities into many levels, against closeness's "
-     f"single one -- got {HARMONIC_CUT_LEVELS}")
-HARMONIC_AFTER_CUT = CUT_C["harmonic"]
+@fact("ROMA_CUT", "CUT_C", "HARMONIC_CUT_LEVELS", "HARMONIC_AFTER_CUT")
+def _cut():
+    ROMA_CUT = roma_graph()
+    ROMA_CUT.remove_edge(*CUT_EDGE)
+    CUT_C = centralities(ROMA_CUT)
+
+    assert not nx.is_connected(ROMA_CUT)
+    assert nx.number_connected_components(ROMA_CUT) == 2
+    assert sorted(nx.connected_components(ROMA_CUT), key=len)[0] == {"Londinium"}
+    # Every closeness score collapses to zero -- not just Londinium's.
+    assert all(v == 0.0 for v in CUT_C["closeness"].values()), \
+        "one unreachable node zeroes the whole ranking"
+    assert len(set(CUT_C["closeness"].values())) == 1
+    # Harmonic keeps ranking, and keeps the same king.
+    assert crown(CUT_C["harmonic"]) == ["Roma"], crown(CUT_C["harmonic"])
+    assert CUT_C["harmonic"]["Londinium"] == 0.0, "an island scores zero, everyone else does not"
+    HARMONIC_CUT_LEVELS = len(set(round(v, 6) for v in CUT_C["harmonic"].values()))
+    assert HARMONIC_CUT_LEVELS >= 8, \
+        ("harmonic must still separate the cities into many levels, against closeness's "
+         f"single one -- got {HARMONIC_CUT_LEVELS}")
+    HARMONIC_AFTER_CUT = CUT_C["harmonic"]
+    return ROMA_CUT, CUT_C, HARMONIC_CUT_LEVELS, HARMONIC_AFTER_CUT
+
 
 # =============================================================================
 # 4. The (N-1) normalizer and the star  (c28)
 # =============================================================================
 STAR_N = 7
-STAR = nx.star_graph(STAR_N - 1)             # node 0 is the hub
-STAR_C = centralities(STAR)
-assert abs(STAR_C["closeness"][0] - 1.0) < 1e-12, "the star's hub must score exactly 1"
-assert crown(STAR_C["closeness"]) == [0]
-# In a star every metric crowns the same node: the deck's Part 8 punchline.
-STAR_CROWNS = {m: crown(STAR_C[m]) for m in METRICS}
-assert all(STAR_CROWNS[m] == [0] for m in METRICS), STAR_CROWNS
+
+
+@fact("STAR", "STAR_C", "STAR_CROWNS")
+def _star():
+    STAR = nx.star_graph(STAR_N - 1)             # node 0 is the hub
+    STAR_C = centralities(STAR)
+    assert abs(STAR_C["closeness"][0] - 1.0) < 1e-12, "the star's hub must score exactly 1"
+    assert crown(STAR_C["closeness"]) == [0]
+    # In a star every metric crowns the same node: the deck's Part 8 punchline.
+    STAR_CROWNS = {m: crown(STAR_C[m]) for m in METRICS}
+    assert all(STAR_CROWNS[m] == [0] for m in METRICS), STAR_CROWNS
+    return STAR, STAR_C, STAR_CROWNS
+
 
 # ...and in a path they do not agree at all.
 PATH_N = 7
-PATH = nx.path_graph(PATH_N)
-PATH_C = centralities(PATH)
-PATH_CROWNS = {m: crown(PATH_C[m]) for m in METRICS}
-assert PATH_CROWNS["degree"] == list(range(1, PATH_N - 1)), \
-    "degree is flat across a path's interior"
-assert PATH_CROWNS["betweenness"] == [PATH_N // 2], "betweenness peaks at the middle"
-assert len(PATH_CROWNS["degree"]) == 5 and len(PATH_CROWNS["betweenness"]) == 1
+
+
+@fact("PATH", "PATH_C", "PATH_CROWNS")
+def _path():
+    PATH = nx.path_graph(PATH_N)
+    PATH_C = centralities(PATH)
+    PATH_CROWNS = {m: crown(PATH_C[m]) for m in METRICS}
+    assert PATH_CROWNS["degree"] == list(range(1, PATH_N - 1)), \
+        "degree is flat across a path's interior"
+    assert PATH_CROWNS["betweenness"] == [PATH_N // 2], "betweenness peaks at the middle"
+    assert len(PATH_CROWNS["degree"]) == 5 and len(PATH_CROWNS["betweenness"]) == 1
+    return PATH, PATH_C, PATH_CROWNS
+
 
 # =============================================================================
 # 5. Counting shortest paths by hand  (c09) -- the Your-turn graph
@@ -242,8 +408,6 @@ assert len(PATH_CROWNS["degree"]) == 5 and len(PATH_CROWNS["betweenness"]) == 1
 # shared. A third node sits on one of them only.
 SIGMA_EDGES = [("S", "A"), ("A", "T"), ("S", "B"), ("B", "T"), ("T", "D")]
 SIGMA_POS = {"S": (0, 1), "A": (1.4, 2), "B": (1.4, 0), "T": (2.8, 1), "D": (4.2, 1)}
-SIGMA = nx.Graph(SIGMA_EDGES)
-SIGMA_C = centralities(SIGMA)
 
 
 def sigma_counts(G, s, t):
@@ -252,24 +416,34 @@ def sigma_counts(G, s, t):
     return len(paths), through
 
 
-SIG_ST, SIG_THROUGH = sigma_counts(SIGMA, "S", "T")
-assert SIG_ST == 2, "S and T are joined by exactly two shortest paths"
-assert SIG_THROUGH["A"] == 1 and SIG_THROUGH["B"] == 1
+@fact(
+    "SIGMA", "SIGMA_C", "SIG_ST", "SIG_THROUGH", "SIG_SD", "SIG_SD_THROUGH",
+    "SIGMA_BT",
+)
+def _sigma():
+    SIGMA = nx.Graph(SIGMA_EDGES)
+    SIGMA_C = centralities(SIGMA)
+
+    SIG_ST, SIG_THROUGH = sigma_counts(SIGMA, "S", "T")
+    assert SIG_ST == 2, "S and T are joined by exactly two shortest paths"
+    assert SIG_THROUGH["A"] == 1 and SIG_THROUGH["B"] == 1
 
-# The pair the Your-turn slide asks about is S-D, because it separates the two
-# rules in one question: the credit for a tie is SHARED, and a node every route
-# must use takes the whole thing.
-SIG_SD, SIG_SD_THROUGH = sigma_counts(SIGMA, "S", "D")
-assert SIG_SD == 2, "two shortest S-D routes"
-assert SIG_SD_THROUGH["A"] == 1 and SIG_SD_THROUGH["B"] == 1, "each carries one of them"
-assert SIG_SD_THROUGH["T"] == 2, "both of them run through T"
+    # The pair the Your-turn slide asks about is S-D, because it separates the two
+    # rules in one question: the credit for a tie is SHARED, and a node every route
+    # must use takes the whole thing.
+    SIG_SD, SIG_SD_THROUGH = sigma_counts(SIGMA, "S", "D")
+    assert SIG_SD == 2, "two shortest S-D routes"
+    assert SIG_SD_THROUGH["A"] == 1 and SIG_SD_THROUGH["B"] == 1, "each carries one of them"
+    assert SIG_SD_THROUGH["T"] == 2, "both of them run through T"
+
+    SIGMA_BT = nx.betweenness_centrality(SIGMA, normalized=False)
+    assert abs(SIGMA_BT["A"] - 1.0) < 1e-12, SIGMA_BT      # 1/2 from S-T, 1/2 from S-D
+    assert abs(SIGMA_BT["B"] - 1.0) < 1e-12, SIGMA_BT
+    assert abs(SIGMA_BT["T"] - 3.5) < 1e-12, SIGMA_BT      # A-D, B-D, S-D, and half of A-B
+    assert abs(SIGMA_BT["S"] - 0.5) < 1e-12, SIGMA_BT
+    assert SIGMA_BT["D"] == 0.0
+    return SIGMA, SIGMA_C, SIG_ST, SIG_THROUGH, SIG_SD, SIG_SD_THROUGH, SIGMA_BT
 
-SIGMA_BT = nx.betweenness_centrality(SIGMA, normalized=False)
-assert abs(SIGMA_BT["A"] - 1.0) < 1e-12, SIGMA_BT      # 1/2 from S-T, 1/2 from S-D
-assert abs(SIGMA_BT["B"] - 1.0) < 1e-12, SIGMA_BT
-assert abs(SIGMA_BT["T"] - 3.5) < 1e-12, SIGMA_BT      # A-D, B-D, S-D, and half of A-B
-assert abs(SIGMA_BT["S"] - 0.5) < 1e-12, SIGMA_BT
-assert SIGMA_BT["D"] == 0.0
 
 # =============================================================================
 # 6. The broker: two clusters joined by one low-degree node  (c10)
@@ -279,19 +453,25 @@ BROKER_RIGHT = ["R1", "R2", "R3", "R4"]
 BROKER_EDGES = [(a, b) for a, b in itertools.combinations(BROKER_LEFT, 2)]
 BROKER_EDGES += [(a, b) for a, b in itertools.combinations(BROKER_RIGHT, 2)]
 BROKER_EDGES += [("L1", "M"), ("M", "R1")]
-BROKER = nx.Graph(BROKER_EDGES)
-BROKER_C = centralities(BROKER)
 
-assert BROKER.degree("M") == 2, "the broker holds exactly two edges"
-assert max(dict(BROKER.degree()).values()) == 4
-assert crown(BROKER_C["betweenness"]) == ["M"], crown(BROKER_C["betweenness"])
-assert crown(BROKER_C["degree"]) == sorted(BROKER_LEFT + BROKER_RIGHT)[:0] or True
-BROKER_DEG_CROWN = crown(BROKER_C["degree"])
-assert "M" not in BROKER_DEG_CROWN, "the broker is nobody by degree"
-# How much of the flow it holds, in the deck's words.
-_bt = nx.betweenness_centrality(BROKER, normalized=False)
-assert _bt["M"] == 16.0, _bt["M"]
-BROKER_PAIRS = int(_bt["M"])
+
+@fact("BROKER", "BROKER_C", "BROKER_DEG_CROWN", "BROKER_PAIRS")
+def _broker():
+    BROKER = nx.Graph(BROKER_EDGES)
+    BROKER_C = centralities(BROKER)
+
+    assert BROKER.degree("M") == 2, "the broker holds exactly two edges"
+    assert max(dict(BROKER.degree()).values()) == 4
+    assert crown(BROKER_C["betweenness"]) == ["M"], crown(BROKER_C["betweenness"])
+    assert crown(BROKER_C["degree"]) == sorted(BROKER_LEFT + BROKER_RIGHT)[:0] or True
+    BROKER_DEG_CROWN = crown(BROKER_C["degree"])
+    assert "M" not in BROKER_DEG_CROWN, "the broker is nobody by degree"
+    # How much of the flow it holds, in the deck's words.
+    bt = nx.betweenness_centrality(BROKER, normalized=False)
+    assert bt["M"] == 16.0, bt["M"]
+    BROKER_PAIRS = int(bt["M"])
+    return BROKER, BROKER_C, BROKER_DEG_CROWN, BROKER_PAIRS
+
 
 # =============================================================================
 # 6b. The club network  (c01) -- the same roster as the take-home exercise
@@ -309,69 +489,100 @@ CLUBS = {
     "Math": ["Noah", "Lucas"],
     "Tennis": ["Noah", "Henry"],
 }
-CLUB = nx.Graph()
-for _members in CLUBS.values():
-    CLUB.add_nodes_from(_members)
-    CLUB.add_edges_from(itertools.combinations(_members, 2))
-CLUB_C = centralities(CLUB)
-
-assert CLUB.number_of_nodes() == 13, CLUB.number_of_nodes()
-assert nx.is_connected(CLUB)
-# The whole point of Part 1: the two questions the handout asks first, without any
-# calculation, already have two different answers.
-CLUB_SPREAD = crown(CLUB_C["degree"])          # "who do you tell first?"
-CLUB_BROKER = crown(CLUB_C["betweenness"])     # "who coordinates between clubs?"
-assert CLUB_SPREAD == ["Noah"], CLUB_SPREAD
-assert CLUB_BROKER == ["Alex"], CLUB_BROKER
-assert CLUB_SPREAD != CLUB_BROKER, "Part 1 needs these to disagree"
-assert CLUB.degree("Noah") == 6 and CLUB.degree("Alex") == 4
-# Closeness names a THIRD student, which is the whole of Part 3 in advance.
-CLUB_CLOSE = crown(CLUB_C["closeness"])
-assert CLUB_CLOSE == ["Sophia"], CLUB_CLOSE
-assert len({CLUB_SPREAD[0], CLUB_BROKER[0], CLUB_CLOSE[0]}) == 3, \
-    "three questions, three different students -- this is slide 12's whole content"
-# And Alex brokers with two friends fewer than Noah.
-assert CLUB_C["betweenness"]["Alex"] > CLUB_C["betweenness"]["Noah"]
-assert CLUB.degree("Alex") < CLUB.degree("Noah")
-assert CLUB.number_of_edges() == 17 and nx.diameter(CLUB) == 5
-CLUB_PLANAR = nx.check_planarity(CLUB)[0]
-assert CLUB_PLANAR, "the club network must be drawable without a crossing"
+
+
+@fact("CLUB", "CLUB_C", "CLUB_SPREAD", "CLUB_BROKER", "CLUB_CLOSE", "CLUB_PLANAR")
+def _club():
+    CLUB = nx.Graph()
+    for _members in CLUBS.values():
+        CLUB.add_nodes_from(_members)
+        CLUB.add_edges_from(itertools.combinations(_members, 2))
+    CLUB_C = centralities(CLUB)
+
+    assert CLUB.number_of_nodes() == 13, CLUB.number_of_nodes()
+    assert nx.is_connected(CLUB)
+    # The whole point of Part 1: the two questions the handout asks first, without any
+    # calculation, already have two different answers.
+    CLUB_SPREAD = crown(CLUB_C["degree"])          # "who do you tell first?"
+    CLUB_BROKER = crown(CLUB_C["betweenness"])     # "who coordinates between clubs?"
+    assert CLUB_SPREAD == ["Noah"], CLUB_SPREAD
+    assert CLUB_BROKER == ["Alex"], CLUB_BROKER
+    assert CLUB_SPREAD != CLUB_BROKER, "Part 1 needs these to disagree"
+    assert CLUB.degree("Noah") == 6 and CLUB.degree("Alex") == 4
+    # Closeness names a THIRD student, which is the whole of Part 3 in advance.
+    CLUB_CLOSE = crown(CLUB_C["closeness"])
+    assert CLUB_CLOSE == ["Sophia"], CLUB_CLOSE
+    assert len({CLUB_SPREAD[0], CLUB_BROKER[0], CLUB_CLOSE[0]}) == 3, \
+        "three questions, three different students -- this is slide 12's whole content"
+    # And Alex brokers with two friends fewer than Noah.
+    assert CLUB_C["betweenness"]["Alex"] > CLUB_C["betweenness"]["Noah"]
+    assert CLUB.degree("Alex") < CLUB.degree("Noah")
+    assert CLUB.number_of_edges() == 17 and nx.diameter(CLUB) == 5
+    CLUB_PLANAR = nx.check_planarity(CLUB)[0]
+    assert CLUB_PLANAR, "the club network must be drawable without a crossing"
+    return CLUB, CLUB_C, CLUB_SPREAD, CLUB_BROKER, CLUB_CLOSE, CLUB_PLANAR
 
 
 # =============================================================================
 # 6c. Attacking the map: by degree, or by betweenness  (M03 recall)
 # =============================================================================
-def attack(G, metric, k):
-    """Remove k nodes, recomputing the metric after each removal (adaptive)."""
+def attack_steps(G, metric):
+    """Adaptive attack as a stream: yield (node removed, giant-component fraction).
+
+    Each removal recomputes `metric` alone on what is left and strikes its top node,
+    the alphabetically first on a tie. Runs until one node remains; take what you need.
+    """
     H = G.copy()
-    removed = []
-    for _ in range(k):
-        if H.number_of_nodes() <= 1:
-            break
-        c = centralities(H)[metric]
-        target = max(sorted(c), key=lambda n: c[n])
+    n = G.number_of_nodes()
+    while H.number_of_nodes() > 1:
+        names = list(H)
+        A = nx.to_scipy_sparse_array(H, nodelist=names, format="csr")
+        c = dict(zip(names, centrality_arrays(A, metrics=[metric])[metric].tolist()))
+        target = max(sorted(c), key=lambda v: c[v])
         H.remove_node(target)
+        yield target, max((len(cc) for cc in nx.connected_components(H)), default=0) / n
+
+
+def attack_curve(G, metric, k=None):
+    """The whole attack in one pass: (removal order, giant fraction after 0..k removals)."""
+    giant = [max((len(c) for c in nx.connected_components(G)), default=0)
+             / G.number_of_nodes()]
+    removed = []
+    for target, g in itertools.islice(attack_steps(G, metric), k):
         removed.append(target)
-    giant = max((len(c) for c in nx.connected_components(H)), default=0)
-    return removed, giant / G.number_of_nodes()
+        giant.append(g)
+    return removed, giant
+
+
+def attack(G, metric, k):
+    """Remove k nodes, recomputing the metric after each removal (adaptive)."""
+    removed, giant = attack_curve(G, metric, k)
+    return removed, giant[-1]
 
 
-ATTACK_CURVE = {m: [attack(ROMA, m, k)[1] for k in range(0, 7)]
-                for m in ("degree", "betweenness")}
 # The two strategies agree on the first strike and part company on the second, so
 # that is the number the slide names. Quoting a k where they happen to tie would
 # have been a false claim dressed as an M03 callback.
 ATTACK_K = 2
-ATTACK_DEGREE = attack(ROMA, "degree", ATTACK_K)
-ATTACK_BETWEEN = attack(ROMA, "betweenness", ATTACK_K)
-assert ATTACK_DEGREE[0][0] == ATTACK_BETWEEN[0][0] == "Roma", "both open on Rome"
-assert ATTACK_BETWEEN[1] < ATTACK_DEGREE[1], (ATTACK_DEGREE, ATTACK_BETWEEN)
-assert ATTACK_DEGREE[0][1] == "Alexandria" and ATTACK_BETWEEN[0][1] == "Tarraco"
-# ...and the city betweenness reaches for second has two roads, against four.
-assert ROMA.degree("Tarraco") == 2 and ROMA.degree("Alexandria") == 4
-ATTACK_SURVIVORS = {m: int(round(v[ATTACK_K] * ROMA.number_of_nodes()))
-                    for m, v in ATTACK_CURVE.items()}
-assert ATTACK_SURVIVORS == {"degree": 7, "betweenness": 5}, ATTACK_SURVIVORS
+
+
+@fact("ATTACK_CURVE", "ATTACK_DEGREE", "ATTACK_BETWEEN", "ATTACK_SURVIVORS")
+def _attacks(ROMA):
+    # One pass per strategy; every k below is a prefix of it.
+    attacks = {m: attack_curve(ROMA, m, 6) for m in ("degree", "betweenness")}
+    ATTACK_CURVE = {m: giant for m, (_, giant) in attacks.items()}
+    ATTACK_DEGREE = (attacks["degree"][0][:ATTACK_K], ATTACK_CURVE["degree"][ATTACK_K])
+    ATTACK_BETWEEN = (attacks["betweenness"][0][:ATTACK_K],
+                      ATTACK_CURVE["betweenness"][ATTACK_K])
+    assert ATTACK_DEGREE[0][0] == ATTACK_BETWEEN[0][0] == "Roma", "both open on Rome"
+    assert ATTACK_BETWEEN[1] < ATTACK_DEGREE[1], (ATTACK_DEGREE, ATTACK_BETWEEN)
+    assert ATTACK_DEGREE[0][1] == "Alexandria" and ATTACK_BETWEEN[0][1] == "Tarraco"
+    # ...and the city betweenness reaches for second has two roads, against four.
+    assert ROMA.degree("Tarraco") == 2 and ROMA.degree("Alexandria") == 4
+    ATTACK_SURVIVORS = {m: int(round(v[ATTACK_K] * ROMA.number_of_nodes()))
+                        for m, v in ATTACK_CURVE.items()}
+    assert ATTACK_SURVIVORS == {"degree": 7, "betweenness": 5}, ATTACK_SURVIVORS
+    return ATTACK_CURVE, ATTACK_DEGREE, ATTACK_BETWEEN, ATTACK_SURVIVORS
 
 
 # =============================================================================
@@ -382,17 +593,23 @@ LOCAL_CORE = ["c1", "c2", "c3", "c4", "c5"]
 LOCAL_EDGES = [(a, b) for a, b in itertools.combinations(LOCAL_CORE, 2)]
 LOCAL_TAIL = ["t1", "t2", "t3", "t4"]
 LOCAL_EDGES += [("c1", "t1"), ("t1", "t2"), ("t2", "t3"), ("t3", "t4")]
-LOCAL = nx.Graph(LOCAL_EDGES)
-LOCAL_C = centralities(LOCAL)
 
-_ev = LOCAL_C["eigenvector"]
-assert crown(_ev)[0] in LOCAL_CORE
-LOCAL_TAIL_FRACTION = _ev["t4"] / max(_ev.values())
-assert LOCAL_TAIL_FRACTION < 0.02, LOCAL_TAIL_FRACTION
-# Katz with a floor lifts the same tail node off the ground by more than 10x.
-_kz = LOCAL_C["katz"]
-LOCAL_KATZ_FRACTION = _kz["t4"] / max(_kz.values())
-assert LOCAL_KATZ_FRACTION > 10 * LOCAL_TAIL_FRACTION, (LOCAL_TAIL_FRACTION, LOCAL_KATZ_FRACTION)
+
+@fact("LOCAL", "LOCAL_C", "LOCAL_TAIL_FRACTION", "LOCAL_KATZ_FRACTION")
+def _local():
+    LOCAL = nx.Graph(LOCAL_EDGES)
+    LOCAL_C = centralities(LOCAL)
+
+    ev = LOCAL_C["eigenvector"]
+    assert crown(ev)[0] in LOCAL_CORE
+    LOCAL_TAIL_FRACTION = ev["t4"] / max(ev.values())
+    assert LOCAL_TAIL_FRACTION < 0.02, LOCAL_TAIL_FRACTION
+    # Katz with a floor lifts the same tail node off the ground by more than 10x.
+    kz = LOCAL_C["katz"]
+    LOCAL_KATZ_FRACTION = kz["t4"] / max(kz.values())
+    assert LOCAL_KATZ_FRACTION > 10 * LOCAL_TAIL_FRACTION, (
+        LOCAL_TAIL_FRACTION, LOCAL_KATZ_FRACTION)
+    return LOCAL, LOCAL_C, LOCAL_TAIL_FRACTION, LOCAL_KATZ_FRACTION
 
 
 def katz_series(G, lam, terms=6):
@@ -409,12 +626,6 @@ def katz_series(G, lam, terms=6):
     return rows
 
 
-ROMA_LMAX = ROMA_C["_lambda_max"]
-ROMA_KATZ_LAMBDA = ROMA_C["_katz_lambda"]
-KATZ_CRITICAL = 1.0 / ROMA_LMAX
-assert 3.0 < ROMA_LMAX < 4.0, ROMA_LMAX
-assert ROMA_KATZ_LAMBDA < KATZ_CRITICAL
-
 # Above the critical lambda the solve returns negative scores -- the "it breaks"
 # figure prints these, so they are computed, never invented.
 def katz_at(G, lam):
@@ -423,17 +634,31 @@ def katz_at(G, lam):
     return dict(zip(names, np.linalg.solve(np.eye(len(A)) - lam * A, np.ones(len(A)))))
 
 
-KATZ_BAD_LAMBDA = 1.15 / ROMA_LMAX
-KATZ_BAD = katz_at(ROMA, KATZ_BAD_LAMBDA)
-assert min(KATZ_BAD.values()) < 0, "past the critical lambda some score must go negative"
-KATZ_BAD_NEGATIVE = sorted(k for k, v in KATZ_BAD.items() if v < 0)
-assert len(KATZ_BAD_NEGATIVE) >= 3, KATZ_BAD_NEGATIVE
+@fact(
+    "ROMA_LMAX", "ROMA_KATZ_LAMBDA", "KATZ_CRITICAL", "KATZ_BAD_LAMBDA", "KATZ_BAD",
+    "KATZ_BAD_NEGATIVE",
+)
+def _katz(ROMA, ROMA_C):
+    ROMA_LMAX = ROMA_C["_lambda_max"]
+    ROMA_KATZ_LAMBDA = ROMA_C["_katz_lambda"]
+    KATZ_CRITICAL = 1.0 / ROMA_LMAX
+    assert 3.0 < ROMA_LMAX < 4.0, ROMA_LMAX
+    assert ROMA_KATZ_LAMBDA < KATZ_CRITICAL
+
+    KATZ_BAD_LAMBDA = 1.15 / ROMA_LMAX
+    KATZ_BAD = katz_at(ROMA, KATZ_BAD_LAMBDA)
+    assert min(KATZ_BAD.values()) < 0, "past the critical lambda some score must go negative"
+    KATZ_BAD_NEGATIVE = sorted(k for k, v in KATZ_BAD.items() if v < 0)
+    assert len(KATZ_BAD_NEGATIVE) >= 3, KATZ_BAD_NEGATIVE
+
+    # The series diverges there too, which is the same fact seen from the other side.
+    bad_rows = katz_series(ROMA, KATZ_BAD_LAMBDA, terms=12)
+    assert bad_rows[-1][1].max() > bad_rows[3][1].max(), "terms must grow, not shrink"
+    ok_rows = katz_series(ROMA, ROMA_KATZ_LAMBDA, terms=12)
+    assert ok_rows[-1][1].max() < ok_rows[3][1].max(), \
+        "terms must shrink below the critical lambda"
+    return ROMA_LMAX, ROMA_KATZ_LAMBDA, KATZ_CRITICAL, KATZ_BAD_LAMBDA, KATZ_BAD, KATZ_BAD_NEGATIVE
 
-# The series diverges there too, which is the same fact seen from the other side.
-_bad_rows = katz_series(ROMA, KATZ_BAD_LAMBDA, terms=12)
-assert _bad_rows[-1][1].max() > _bad_rows[3][1].max(), "terms must grow, not shrink"
-_ok_rows = katz_series(ROMA, ROMA_KATZ_LAMBDA, terms=12)
-assert _ok_rows[-1][1].max() < _ok_rows[3][1].max(), "terms must shrink below the critical lambda"
 
 # =============================================================================
 # 8. Power iteration  (c14) -- the numbers behind the GIF and the slider
@@ -450,28 +675,10 @@ def power_iteration(G, steps=14):
     return out
 
 
-POWER_TRACE = power_iteration(ROMA, steps=40)
-_final = np.array([POWER_TRACE[-1][n] for n in ROMA])
-_true = np.array([ROMA_C["eigenvector"][n] for n in ROMA])
-assert np.abs(_final - _true).max() < 1e-4, "power iteration must reach the eigenvector"
-# Step 1 is degree, exactly -- the line the deck uses to connect the two metrics.
-assert all(abs(POWER_TRACE[1][n] - ROMA.degree(n) / 5) < 1e-12 for n in ROMA)
-
-# What decays is |lambda_i / lambda_1| for every OTHER eigenvalue, so the rate is
-# set by the largest of them in ABSOLUTE value. On this graph that is the most
-# negative one, not the second largest -- writing |lambda_2/lambda_1| would have
-# quoted 0.72 for a process that actually converges at 0.80.
-_evals = np.sort(np.linalg.eigvalsh(nx.to_numpy_array(ROMA, nodelist=list(ROMA))))
-LAMBDA1 = float(_evals[-1])
-LAMBDA2 = float(max(abs(_evals[0]), abs(_evals[-2])))
-RATIO = LAMBDA2 / LAMBDA1
-assert abs(LAMBDA2 - abs(_evals[0])) < 1e-9, "here the slowest mode is the negative end"
-assert 0.3 < RATIO < 0.95, RATIO
 # Twelve steps is what the GIF and the slider show; by then the error is invisible.
 POWER_SHOW = 12
-_shown = np.array([POWER_TRACE[POWER_SHOW][n] for n in ROMA])
-POWER_SHOW_ERR = float(np.abs(_shown - _true).max())
-assert POWER_SHOW_ERR < 0.01, POWER_SHOW_ERR
+
+
 # What the slider is for: watching how fast the ANSWER settles, not the vector.
 # The full 12-place ranking is still swapping its lower half at step 15, so
 # "the ranking settles at step k" would have been a false claim; the crown and
@@ -480,17 +687,45 @@ def _order(d, k=None):
     return [n for n in sorted(d, key=lambda x: (-d[x], x))][:k]
 
 
-def _settles_at(k):
-    end = _order(POWER_TRACE[-1], k)
-    return next(t for t in range(1, len(POWER_TRACE))
-                if all(_order(POWER_TRACE[s], k) == end
-                       for s in range(t, len(POWER_TRACE))))
-
+def _settles_at(trace, k):
+    end = _order(trace[-1], k)
+    return next(t for t in range(1, len(trace))
+                if all(_order(trace[s], k) == end
+                       for s in range(t, len(trace))))
+
+
+@fact(
+    "POWER_TRACE", "LAMBDA1", "LAMBDA2", "RATIO", "POWER_SHOW_ERR",
+    "POWER_CROWN_SETTLE", "POWER_TOP3_SETTLE",
+)
+def _power(ROMA, ROMA_C):
+    POWER_TRACE = power_iteration(ROMA, steps=40)
+    final = np.array([POWER_TRACE[-1][n] for n in ROMA])
+    true = np.array([ROMA_C["eigenvector"][n] for n in ROMA])
+    assert np.abs(final - true).max() < 1e-4, "power iteration must reach the eigenvector"
+    # Step 1 is degree, exactly -- the line the deck uses to connect the two metrics.
+    assert all(abs(POWER_TRACE[1][n] - ROMA.degree(n) / 5) < 1e-12 for n in ROMA)
+
+    # What decays is |lambda_i / lambda_1| for every OTHER eigenvalue, so the rate is
+    # set by the largest of them in ABSOLUTE value. On this graph that is the most
+    # negative one, not the second largest -- writing |lambda_2/lambda_1| would have
+    # quoted 0.72 for a process that actually converges at 0.80.
+    evals = np.sort(np.linalg.eigvalsh(nx.to_numpy_array(ROMA, nodelist=list(ROMA))))
+    LAMBDA1 = float(evals[-1])
+    LAMBDA2 = float(max(abs(evals[0]), abs(evals[-2])))
+    RATIO = LAMBDA2 / LAMBDA1
+    assert abs(LAMBDA2 - abs(evals[0])) < 1e-9, "here the slowest mode is the negative end"
+    assert 0.3 < RATIO < 0.95, RATIO
+    shown = np.array([POWER_TRACE[POWER_SHOW][n] for n in ROMA])
+    POWER_SHOW_ERR = float(np.abs(shown - true).max())
+    assert POWER_SHOW_ERR < 0.01, POWER_SHOW_ERR
+    POWER_CROWN_SETTLE = _settles_at(POWER_TRACE, 1)
+    POWER_TOP3_SETTLE = _settles_at(POWER_TRACE, 3)
+    assert POWER_CROWN_SETTLE == 1, POWER_CROWN_SETTLE
+    assert 2 <= POWER_TOP3_SETTLE <= 12, POWER_TOP3_SETTLE
+    return (POWER_TRACE, LAMBDA1, LAMBDA2, RATIO, POWER_SHOW_ERR,
+            POWER_CROWN_SETTLE, POWER_TOP3_SETTLE)
 
-POWER_CROWN_SETTLE = _settles_at(1)
-POWER_TOP3_SETTLE = _settles_at(3)
-assert POWER_CROWN_SETTLE == 1, POWER_CROWN_SETTLE
-assert 2 <= POWER_TOP3_SETTLE <= 12, POWER_TOP3_SETTLE
 
 # =============================================================================
 # 9. The eight-page web  (c19-c23, c29, c30)
@@ -538,56 +773,101 @@ def hits(A):
     return hub / hub.max(), aut / aut.max()
 
 
-def pagerank(A, beta=0.15, personal=None, iters=5000):
+def transition(A):
+    """Row-stochastic P (sparse) of A's out-links, and the mask of dangling rows.
+
+    A may be dense or scipy.sparse; P_ij = A_ij / out_i, and a page with no out-links
+    keeps an empty row -- where its score goes is the solver's decision, not P's.
+    """
+    A = sp.csr_matrix(A, dtype=float)
+    out = np.asarray(A.sum(axis=1)).ravel()
+    inv = np.divide(1.0, out, out=np.zeros_like(out), where=out > 0)
+    return sp.diags(inv) @ A, out == 0
+
+
+def pagerank_solve(A, beta=0.15, V=None, tol=1e-12, max_iter=5000):
+    """Every column of C solves c = (1-beta) M c + beta v for the matching column v of V.
+
+    M is the column-stochastic walk with dangling columns spread over v, so each
+    column is its own PageRank and one sparse product per step advances them all.
+    V is n x k (one teleport vector per column, normalized here); None is the uniform
+    vector. Stops once every column moves less than `tol` in L1, and returns
+    (C, iterations, residual).
+    """
+    PT, dangling = transition(A)
+    PT = PT.T.tocsr()
+    n = PT.shape[0]
+    V = np.ones((n, 1)) if V is None else np.asarray(V, float).reshape(n, -1)
+    V = V / V.sum(axis=0)
+    C, res = V.copy(), np.inf
+    for it in range(1, max_iter + 1):
+        nxt = (1 - beta) * (PT @ C + V * C[dangling].sum(axis=0)) + beta * V
+        res = np.abs(nxt - C).sum(axis=0).max()
+        C = nxt
+        if res < tol:
+            break
+    return C / C.sum(axis=0), it, float(res)
+
+
+def pagerank(A, beta=0.15, personal=None, tol=1e-12):
     """c = (1-beta) M c + beta v, with dangling columns spread over v."""
-    n = len(A)
-    v = np.ones(n) / n if personal is None else np.asarray(personal, float)
-    v = v / v.sum()
-    out = A.sum(axis=1)
-    M = np.zeros((n, n))
-    for j in range(n):
-        M[:, j] = A[j, :] / out[j] if out[j] else v
-    c = v.copy()
-    for _ in range(iters):
-        c = (1 - beta) * (M @ c) + beta * v
-    return c / c.sum()
-
-
-WEB_HUB, WEB_AUT = hits(WEB_A)
-WEB_HUB = dict(zip(WEB_NAMES, WEB_HUB))
-WEB_AUT = dict(zip(WEB_NAMES, WEB_AUT))
-WEB_PR = dict(zip(WEB_NAMES, pagerank(WEB_A)))
-
-assert WEB.number_of_nodes() == 8 and WEB.number_of_edges() == 14
-assert nx.is_weakly_connected(WEB)
-WEB_DANGLING = [n for n in WEB_NAMES if WEB.out_degree(n) == 0]
-assert WEB_DANGLING == ["Home"], WEB_DANGLING
-assert WEB.out_degree("Links") == 4 and WEB.in_degree("Links") == 0, \
-    "Links is a page of links that nobody links back to"
-
-WEB_HUB_KING = crown(WEB_HUB)
-WEB_AUT_KING = crown(WEB_AUT)
-WEB_PR_KING = crown(WEB_PR)
-assert WEB_HUB_KING == ["Links"], WEB_HUB_KING
-assert WEB_AUT_KING == ["Blog"], WEB_AUT_KING
-assert WEB_PR_KING == ["Blog"], WEB_PR_KING
-# The deck's Part 7 claim: three crowns, and the hub crown is NOT one of the others.
-assert WEB_HUB_KING != WEB_AUT_KING
-assert WEB_HUB_KING != WEB_PR_KING
-# PageRank ranks Links dead last while HITS crowns it -- that is the disagreement.
-WEB_PR_RANK_OF_LINKS = sorted(WEB_NAMES, key=lambda n: -WEB_PR[n]).index("Links") + 1
-assert WEB_PR_RANK_OF_LINKS == 8, WEB_PR_RANK_OF_LINKS
+    return pagerank_solve(A, beta, personal, tol)[0][:, 0]
+
+
+@fact(
+    "WEB_HUB", "WEB_AUT", "WEB_PR", "WEB_DANGLING", "WEB_HUB_KING", "WEB_AUT_KING",
+    "WEB_PR_KING", "WEB_PR_RANK_OF_LINKS",
+)
+def _web():
+    WEB_HUB, WEB_AUT = hits(WEB_A)
+    WEB_HUB = dict(zip(WEB_NAMES, WEB_HUB))
+    WEB_AUT = dict(zip(WEB_NAMES, WEB_AUT))
+    WEB_PR = dict(zip(WEB_NAMES, pagerank(WEB_A)))
+
+    assert WEB.number_of_nodes() == 8 and WEB.number_of_edges() == 14
+    assert nx.is_weakly_connected(WEB)
+    WEB_DANGLING = [n for n in WEB_NAMES if WEB.out_degree(n) == 0]
+    assert WEB_DANGLING == ["Home"], WEB_DANGLING
+    assert WEB.out_degree("Links") == 4 and WEB.in_degree("Links") == 0, \
+        "Links is a page of links that nobody links back to"
+
+    WEB_HUB_KING = crown(WEB_HUB)
+    WEB_AUT_KING = crown(WEB_AUT)
+    WEB_PR_KING = crown(WEB_PR)
+    assert WEB_HUB_KING == ["Links"], WEB_HUB_KING
+    assert WEB_AUT_KING == ["Blog"], WEB_AUT_KING
+    assert WEB_PR_KING == ["Blog"], WEB_PR_KING
+    # The deck's Part 7 claim: three crowns, and the hub crown is NOT one of the others.
+    assert WEB_HUB_KING != WEB_AUT_KING
+    assert WEB_HUB_KING != WEB_PR_KING
+    # PageRank ranks Links dead last while HITS crowns it -- that is the disagreement.
+    WEB_PR_RANK_OF_LINKS = sorted(WEB_NAMES, key=lambda n: -WEB_PR[n]).index("Links") + 1
+    assert WEB_PR_RANK_OF_LINKS == 8, WEB_PR_RANK_OF_LINKS
+    return (WEB_HUB, WEB_AUT, WEB_PR, WEB_DANGLING,
+            WEB_HUB_KING, WEB_AUT_KING, WEB_PR_KING, WEB_PR_RANK_OF_LINKS)
+
 
 # Undirected HITS degenerates to eigenvector centrality (c29).
-_U = nx.to_numpy_array(ROMA, nodelist=list(ROMA))
-_uh, _ua = hits(_U)
-_ue = np.array([ROMA_C["eigenvector"][n] for n in ROMA])
-assert np.abs(_uh - _ue).max() < 1e-8 and np.abs(_ua - _ue).max() < 1e-8, \
-    "on a symmetric A, hubs and authorities are both the eigenvector centrality"
-_lam_hits = np.linalg.eigvalsh(_U @ _U.T).max()
-assert abs(_lam_hits - ROMA_LMAX ** 2) < 1e-6, "and the eigenvalue is squared"
-
-# Personalized PageRank (c23, c30): bias the teleport onto one page.
+
+
+@fact("HITS_LAMBDA")
+def _hits_undirected(ROMA, ROMA_C, ROMA_LMAX):
+    U = nx.to_numpy_array(ROMA, nodelist=list(ROMA))
+    uh, ua = hits(U)
+    ue = np.array([ROMA_C["eigenvector"][n] for n in ROMA])
+    assert np.abs(uh - ue).max() < 1e-8 and np.abs(ua - ue).max() < 1e-8, \
+        "on a symmetric A, hubs and authorities are both the eigenvector centrality"
+    HITS_LAMBDA = np.linalg.eigvalsh(U @ U.T).max()
+    assert abs(HITS_LAMBDA - ROMA_LMAX ** 2) < 1e-6, "and the eigenvalue is squared"
+    return HITS_LAMBDA
+
+
+# Personalized PageRank (c23, c30): bias the teleport onto one page. Column j of
+# the batched solve with V = I is the PageRank personalized on page j.
+def personalized_all(A=WEB_A, beta=0.15):
+    return pagerank_solve(A, beta, np.eye(A.shape[0]))[0]
+
+
 def personalized(focus, beta=0.15):
     v = np.zeros(len(WEB_NAMES))
     v[WEB_NAMES.index(focus)] = 1.0
@@ -595,54 +875,60 @@ def personalized(focus, beta=0.15):
 
 
 PPR_FOCUS = "Course"
-WEB_PPR = personalized(PPR_FOCUS)
-# Personalizing moves the crown: globally Blog wins by a nose, and biasing the
-# teleport onto Course turns that nose into a length the other way.
-assert crown(WEB_PR) == ["Blog"] and crown(WEB_PPR) == ["Course"], crown(WEB_PPR)
-assert WEB_PPR["Wiki"] > WEB_PR["Wiki"], "a page the focus points at must gain"
-assert WEB_PPR["Home"] < WEB_PR["Home"], "a page far downstream must lose"
-PPR_GLOBAL_MARGIN = float(WEB_PR["Blog"] - WEB_PR["Course"])
-PPR_FOCUS_MARGIN = float(WEB_PPR["Course"] - WEB_PPR["Blog"])
-assert 0 < PPR_GLOBAL_MARGIN < 0.02 < PPR_FOCUS_MARGIN, \
-    (PPR_GLOBAL_MARGIN, PPR_FOCUS_MARGIN)
+
 
 # ...and it equals discounted reachability: sum_k beta (1-beta)^k p^(k).
 def discounted_reachability(focus, beta=0.15, K=400):
     n = len(WEB_NAMES)
     v = np.zeros(n)
     v[WEB_NAMES.index(focus)] = 1.0
-    out = WEB_A.sum(axis=1)
-    M = np.zeros((n, n))
-    for j in range(n):
-        M[:, j] = WEB_A[j, :] / out[j] if out[j] else v
+    PT, dangling = transition(WEB_A)
+    PT = PT.T.tocsr()
     p, total = v.copy(), np.zeros(n)
     for k in range(K):
         total += beta * (1 - beta) ** k * p
-        p = M @ p
+        p = PT @ p + v * p[dangling].sum()
     return total / total.sum()
 
 
-_dr = discounted_reachability(PPR_FOCUS)
-assert np.abs(_dr - np.array([WEB_PPR[n] for n in WEB_NAMES])).max() < 1e-6, \
-    "personalized PageRank IS the discounted reachability sum"
+@fact("WEB_PPR", "PPR_GLOBAL_MARGIN", "PPR_FOCUS_MARGIN")
+def _ppr(WEB_PR):
+    WEB_PPR = personalized(PPR_FOCUS)
+    # Personalizing moves the crown: globally Blog wins by a nose, and biasing the
+    # teleport onto Course turns that nose into a length the other way.
+    assert crown(WEB_PR) == ["Blog"] and crown(WEB_PPR) == ["Course"], crown(WEB_PPR)
+    assert WEB_PPR["Wiki"] > WEB_PR["Wiki"], "a page the focus points at must gain"
+    assert WEB_PPR["Home"] < WEB_PR["Home"], "a page far downstream must lose"
+    PPR_GLOBAL_MARGIN = float(WEB_PR["Blog"] - WEB_PR["Course"])
+    PPR_FOCUS_MARGIN = float(WEB_PPR["Course"] - WEB_PPR["Blog"])
+    assert 0 < PPR_GLOBAL_MARGIN < 0.02 < PPR_FOCUS_MARGIN, \
+        (PPR_GLOBAL_MARGIN, PPR_FOCUS_MARGIN)
+    dr = discounted_reachability(PPR_FOCUS)
+    assert np.abs(dr - np.array([WEB_PPR[n] for n in WEB_NAMES])).max() < 1e-6, \
+        "personalized PageRank IS the discounted reachability sum"
+    batch = personalized_all()
+    assert np.abs(batch[:, WEB_NAMES.index(PPR_FOCUS)]
+                  - np.array([WEB_PPR[n] for n in WEB_NAMES])).max() < 1e-9, \
+        "the batched solve agrees with the one-page solve"
+    return WEB_PPR, PPR_GLOBAL_MARGIN, PPR_FOCUS_MARGIN
+
 
 # The dangling-node fact that motivates teleportation: without it, all the score
 # drains into the dead end.
 def pagerank_no_teleport(A, iters=400):
-    n = len(A)
-    out = A.sum(axis=1)
-    M = np.zeros((n, n))
-    for j in range(n):
-        if out[j]:
-            M[:, j] = A[j, :] / out[j]
-    c = np.ones(n) / n
+    PT = transition(A)[0].T.tocsr()
+    c = np.ones(PT.shape[0]) / PT.shape[0]
     for _ in range(iters):
-        c = M @ c
+        c = PT @ c
     return c
 
 
-_drained = pagerank_no_teleport(WEB_A)
-assert _drained.sum() < 1e-6, "with no teleportation every drop of score leaks away"
+@fact("WEB_DRAINED")
+def _drained():
+    WEB_DRAINED = pagerank_no_teleport(WEB_A)
+    assert WEB_DRAINED.sum() < 1e-6, "with no teleportation every drop of score leaks away"
+    return WEB_DRAINED
+
 
 # =============================================================================
 # 10. Cost  (c25) -- the numbers behind the cost curve
@@ -694,37 +980,102 @@ def _crosses(e, f):
     return ((d1 > 0) != (d2 > 0)) and ((d3 > 0) != (d4 > 0))
 
 
-def crown_robustness():
+def _joined(edges, cities=tuple(ROMA_POS)):
+    """Do `edges` connect every city?  Union-find; this runs once per search node."""
+    root = {c: c for c in cities}
+
+    def find(c):
+        while root[c] != c:
+            root[c] = root[root[c]]
+            c = root[c]
+        return c
+    parts = len(root)
+    for a, b in edges:
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            root[ra] = rb
+            parts -= 1
+    return parts == 1
+
+
+def _drawable_picks(must, opt):
+    """Every subset of `opt` that draws with `must` without a crossing and connects the map.
+
+    Branch and bound over `opt` in order, taking or leaving one route at a time. The
+    crossings are tested once, up front, into a conflict mask per route: a route that
+    crosses a required one is never offered, and taking a route strikes everything it
+    crosses from the rest. A branch is cut as soon as even every route still on offer
+    could not join the map, so no disconnected map is ever built.
+    """
+    if any(_crosses(e, f) for e, f in itertools.combinations(must, 2)):
+        return
+    free = [k for k, e in enumerate(opt) if not any(_crosses(e, f) for f in must)]
+    clash = [sum(1 << j for j, f in enumerate(opt) if _crosses(e, f)) for e in opt]
+    chosen = []
+
+    def walk(at, banned):
+        offer = [k for k in free if k >= at and not banned >> k & 1]
+        if not _joined(must + [opt[k] for k in chosen + offer]):
+            return
+        if not offer:
+            yield tuple(chosen)
+            return
+        k = offer[0]
+        chosen.append(k)
+        yield from walk(k + 1, banned | clash[k])
+        chosen.pop()
+        yield from walk(k + 1, banned | 1 << k)
+
+    yield from walk(0, 0)
+
+
+def _crown_keeps(job):
+    """Worker: how many of these maps leave Rome each crown?"""
+    must, opt, picks = job
+    keeps = {m: 0 for m in METRICS}
+    for pick in picks:
+        G = nx.Graph()
+        G.add_nodes_from(ROMA_POS)
+        G.add_edges_from(must + [opt[k] for k in pick])
+        c = centralities(G)
+        for m in METRICS:
+            if "Roma" in crown(c[m]):
+                keeps[m] += 1
+    return keeps
+
+
+def crown_robustness(jobs=None):
     """How often does Rome keep each crown, over every map we could have drawn?
 
     Enumerates every drawable (no crossings), connected subset of the documented
     route pool that keeps Rome's own five routes and the western backbone, and
     counts the variants in which Rome still holds each crown.
 
-    Slow (~1 min): called from main(), never at import.
+    Only drawable, connected maps are ever generated (`_drawable_picks`), and their
+    centralities are computed across `jobs` processes (default: one per core). Each
+    map is built with its edges in the same order as a plain walk over every subset
+    would build it, so the counts are exact.
+
+    Slow (seconds): called from main(), never at import.
     """
     backbone = [(a, b) for a, b, _ in ROMA_EDGES[:11]]
     must = list(dict.fromkeys(backbone + ROME_ROUTES))
     pool = [(a, b) for a, b, _ in ROMA_EDGES] + [(a, b) for a, b, _ in EXTRA_ROUTES]
     opt = [e for e in pool if e not in must]
-    examined = 0
+    picks = list(_drawable_picks(must, opt))
+    jobs = min(jobs or os.cpu_count() or 1, max(len(picks), 1))
+    size = -(-len(picks) // (4 * jobs)) or 1              # ~4 chunks a worker, to balance
+    chunks = [(must, opt, picks[i:i + size]) for i in range(0, len(picks), size)]
     keeps = {m: 0 for m in METRICS}
-    for r in range(len(opt) + 1):
-        for pick in itertools.combinations(opt, r):
-            E = must + list(pick)
-            if any(_crosses(e, f) for e, f in itertools.combinations(E, 2)):
-                continue                       # not drawable without a crossing
-            G = nx.Graph()
-            G.add_nodes_from(ROMA_POS)
-            G.add_edges_from(E)
-            if not nx.is_connected(G):
-                continue
-            examined += 1
-            c = centralities(G)
-            for m in METRICS:
-                if "Roma" in crown(c[m]):
-                    keeps[m] += 1
-    return examined, keeps
+    if jobs > 1:
+        with ProcessPoolExecutor(jobs) as ex:
+            parts = list(ex.map(_crown_keeps, chunks))
+    else:
+        parts = [_crown_keeps(c) for c in chunks]
+    for part in parts:
+        for m in METRICS:
+            keeps[m] += part[m]
+    return len(picks), keeps
 
 
 # The one redraw the deck puts on a slide: trade the Thessaly road for the Balkan
@@ -733,18 +1084,23 @@ def crown_robustness():
 REDRAW_OUT = ("Thessalonica", "Athenae")
 REDRAW_IN = [("Mediolanum", "Thessalonica"), ("Carthago", "Massilia")]
 _redraw_E = [e for e in [(a, b) for a, b, _ in ROMA_EDGES] if e != REDRAW_OUT] + REDRAW_IN
-REDRAW = nx.Graph()
-REDRAW.add_nodes_from(ROMA_POS)
-REDRAW.add_edges_from(_redraw_E)
-REDRAW_C = centralities(REDRAW)
-REDRAW_CROWNS = {m: crown(REDRAW_C[m]) for m in METRICS}
 
-assert nx.is_connected(REDRAW) and nx.diameter(REDRAW) == 5
-assert not any(_crosses(e, f) for e, f in itertools.combinations(_redraw_E, 2)), \
-    "the redraw must still be drawable without a crossing"
-assert REDRAW_CROWNS["betweenness"] == ["Mediolanum"], REDRAW_CROWNS["betweenness"]
-for m in ["degree", "closeness", "harmonic", "eigenvector", "katz"]:
-    assert REDRAW_CROWNS[m] == ["Roma"], (m, REDRAW_CROWNS[m])
+
+@fact("REDRAW", "REDRAW_C", "REDRAW_CROWNS")
+def _redraw():
+    REDRAW = nx.Graph()
+    REDRAW.add_nodes_from(ROMA_POS)
+    REDRAW.add_edges_from(_redraw_E)
+    REDRAW_C = centralities(REDRAW)
+    REDRAW_CROWNS = {m: crown(REDRAW_C[m]) for m in METRICS}
+
+    assert nx.is_connected(REDRAW) and nx.diameter(REDRAW) == 5
+    assert not any(_crosses(e, f) for e, f in itertools.combinations(_redraw_E, 2)), \
+        "the redraw must still be drawable without a crossing"
+    assert REDRAW_CROWNS["betweenness"] == ["Mediolanum"], REDRAW_CROWNS["betweenness"]
+    for m in ["degree", "closeness", "harmonic", "eigenvector", "katz"]:
+        assert REDRAW_CROWNS[m] == ["Roma"], (m, REDRAW_CROWNS[m])
+    return REDRAW, REDRAW_C, REDRAW_CROWNS
 
 
 # =============================================================================
@@ -755,71 +1111,74 @@ def _fmt(v):
 
 
 def main():
+    f = {n: __getattr__(n) for n in _MAKERS}
     print("=" * 78)
     print("ROMAN ROAD NETWORK   12 cities, 18 documented routes, diameter "
-          f"{nx.diameter(ROMA)}")
+          f"{nx.diameter(f['ROMA'])}")
     print("=" * 78)
     for m in METRICS:
-        print(f"\n  {m}   crown: {', '.join(ROMA_CROWNS[m])}")
-        for n, v in podium(ROMA_C[m], k=4):
-            print(f"      {n:14s} {_fmt(v):>8s}   ({ROMA.degree(n)} roads)")
-    print(f"\n  lambda_max = {ROMA_LMAX:.4f}   1/lambda_max = {KATZ_CRITICAL:.4f}")
-    print(f"  Katz uses lambda = {ROMA_KATZ_LAMBDA:.4f}  ({KATZ_SAFE} of critical)")
-    print(f"  at lambda = {KATZ_BAD_LAMBDA:.4f} these go negative: "
-          f"{', '.join(KATZ_BAD_NEGATIVE)}")
-    print(f"  slowest mode |lambda/lambda_1| = {RATIO:.3f}; crown settles at step "
-          f"{POWER_CROWN_SETTLE}, podium at {POWER_TOP3_SETTLE}, "
-          f"error at step {POWER_SHOW} is {POWER_SHOW_ERR:.4f}")
-    print(f"  Alexandria trails Rome by {EIG_GAP_PCT}% on eigenvector, "
-          f"{DEG_GAP:.0f} road on degree")
+        print(f"\n  {m}   crown: {', '.join(f['ROMA_CROWNS'][m])}")
+        for n, v in podium(f["ROMA_C"][m], k=4):
+            print(f"      {n:14s} {_fmt(v):>8s}   ({f['ROMA'].degree(n)} roads)")
+    print(f"\n  lambda_max = {f['ROMA_LMAX']:.4f}   1/lambda_max = {f['KATZ_CRITICAL']:.4f}")
+    print(f"  Katz uses lambda = {f['ROMA_KATZ_LAMBDA']:.4f}  ({KATZ_SAFE} of critical)")
+    print(f"  at lambda = {f['KATZ_BAD_LAMBDA']:.4f} these go negative: "
+          f"{', '.join(f['KATZ_BAD_NEGATIVE'])}")
+    print(f"  slowest mode |lambda/lambda_1| = {f['RATIO']:.3f}; crown settles at step "
+          f"{f['POWER_CROWN_SETTLE']}, podium at {f['POWER_TOP3_SETTLE']}, "
+          f"error at step {POWER_SHOW} is {f['POWER_SHOW_ERR']:.4f}")
+    print(f"  Alexandria trails Rome by {f['EIG_GAP_PCT']}% on eigenvector, "
+          f"{f['DEG_GAP']:.0f} road on degree")
 
     print("\n" + "=" * 78)
     print("CUT THE CHANNEL CROSSING")
     print("=" * 78)
-    print("  every closeness score:", set(CUT_C['closeness'].values()))
+    print("  every closeness score:", set(f["CUT_C"]['closeness'].values()))
     print("  harmonic still ranks: ", ", ".join(
-        f"{n} {v:.2f}" for n, v in podium(CUT_C["harmonic"], k=4)))
-    print(f"  Londinium harmonic = {CUT_C['harmonic']['Londinium']:.1f}")
+        f"{n} {v:.2f}" for n, v in podium(f["CUT_C"]["harmonic"], k=4)))
+    print(f"  Londinium harmonic = {f['CUT_C']['harmonic']['Londinium']:.1f}")
 
     print("\n" + "=" * 78)
     print("EIGHT-PAGE WEB   8 pages, 14 links")
     print("=" * 78)
-    print(f"  hub crown       {WEB_HUB_KING}   " +
-          ", ".join(f"{n} {WEB_HUB[n]:.2f}" for n, _ in podium(WEB_HUB, 3)))
-    print(f"  authority crown {WEB_AUT_KING}   " +
-          ", ".join(f"{n} {WEB_AUT[n]:.2f}" for n, _ in podium(WEB_AUT, 3)))
-    print(f"  PageRank crown  {WEB_PR_KING}   " +
-          ", ".join(f"{n} {WEB_PR[n]:.3f}" for n, _ in podium(WEB_PR, 3)))
-    print(f"  PageRank ranks the hub king {WEB_PR_RANK_OF_LINKS}th of 8")
-    print(f"  dangling page: {WEB_DANGLING[0]}")
+    print(f"  hub crown       {f['WEB_HUB_KING']}   " +
+          ", ".join(f"{n} {f['WEB_HUB'][n]:.2f}" for n, _ in podium(f["WEB_HUB"], 3)))
+    print(f"  authority crown {f['WEB_AUT_KING']}   " +
+          ", ".join(f"{n} {f['WEB_AUT'][n]:.2f}" for n, _ in podium(f["WEB_AUT"], 3)))
+    print(f"  PageRank crown  {f['WEB_PR_KING']}   " +
+          ", ".join(f"{n} {f['WEB_PR'][n]:.3f}" for n, _ in podium(f["WEB_PR"], 3)))
+    print(f"  PageRank ranks the hub king {f['WEB_PR_RANK_OF_LINKS']}th of 8")
+    print(f"  dangling page: {f['WEB_DANGLING'][0]}")
     print(f"  personalized on {PPR_FOCUS}: " +
-          ", ".join(f"{n} {WEB_PPR[n]:.3f}" for n, _ in podium(WEB_PPR, 4)))
+          ", ".join(f"{n} {f['WEB_PPR'][n]:.3f}" for n, _ in podium(f["WEB_PPR"], 4)))
 
     print("\n" + "=" * 78)
     print("BROKER / STAR / PATH / LOCALIZATION")
     print("=" * 78)
-    print(f"  broker M: degree 2, betweenness crown {crown(BROKER_C['betweenness'])}, "
-          f"{BROKER_PAIRS} pairs pass through it")
+    print(f"  broker M: degree 2, betweenness crown {crown(f['BROKER_C']['betweenness'])}, "
+          f"{f['BROKER_PAIRS']} pairs pass through it")
     print(f"  star: every metric crowns the hub; closeness = "
-          f"{STAR_C['closeness'][0]:.1f} exactly")
-    print(f"  path: degree crowns {len(PATH_CROWNS['degree'])} nodes, betweenness "
-          f"crowns {PATH_CROWNS['betweenness']}")
-    print(f"  localization: tail node scores {LOCAL_TAIL_FRACTION:.4f} of the top on "
-          f"eigenvector, {LOCAL_KATZ_FRACTION:.3f} on Katz")
-    print(f"  sigma demo: sigma_ST = {SIG_ST}, A and B earn 1/2 each")
+          f"{f['STAR_C']['closeness'][0]:.1f} exactly")
+    print(f"  path: degree crowns {len(f['PATH_CROWNS']['degree'])} nodes, betweenness "
+          f"crowns {f['PATH_CROWNS']['betweenness']}")
+    print(f"  localization: tail node scores {f['LOCAL_TAIL_FRACTION']:.4f} of the top on "
+          f"eigenvector, {f['LOCAL_KATZ_FRACTION']:.3f} on Katz")
+    print(f"  sigma demo: sigma_ST = {f['SIG_ST']}, A and B earn 1/2 each")
 
     print("\n" + "=" * 78)
     print("THE CLUB NETWORK   13 students, 17 edges (the take-home roster)")
     print("=" * 78)
-    print(f"  tell first (degree)     {CLUB_SPREAD[0]}  ({CLUB.degree(CLUB_SPREAD[0])} friends)")
-    print(f"  closest to everyone     {CLUB_CLOSE[0]}  ({CLUB.degree(CLUB_CLOSE[0])} friends)")
-    print(f"  coordinates (between)   {CLUB_BROKER[0]}  ({CLUB.degree(CLUB_BROKER[0])} friends)")
+    for label, key in [("tell first (degree)", "CLUB_SPREAD"),
+                       ("closest to everyone", "CLUB_CLOSE"),
+                       ("coordinates (between)", "CLUB_BROKER")]:
+        who = f[key][0]
+        print(f"  {label:23s} {who}  ({f['CLUB'].degree(who)} friends)")
     print(f"  attacking the road map: {ATTACK_K} strikes by degree leave "
-          f"{ATTACK_SURVIVORS['degree']} cities joined, by betweenness "
-          f"{ATTACK_SURVIVORS['betweenness']}")
-    print(f"     degree takes      {', '.join(ATTACK_DEGREE[0])}")
-    print(f"     betweenness takes {', '.join(ATTACK_BETWEEN[0])}  "
-          f"({ATTACK_BETWEEN[0][1]} has {ROMA.degree(ATTACK_BETWEEN[0][1])} roads)")
+          f"{f['ATTACK_SURVIVORS']['degree']} cities joined, by betweenness "
+          f"{f['ATTACK_SURVIVORS']['betweenness']}")
+    print(f"     degree takes      {', '.join(f['ATTACK_DEGREE'][0])}")
+    print(f"     betweenness takes {', '.join(f['ATTACK_BETWEEN'][0])}  "
+          f"({f['ATTACK_BETWEEN'][0][1]} has {f['ROMA'].degree(f['ATTACK_BETWEEN'][0][1])} roads)")
 
     print("\n" + "=" * 78)
     print("HOW MUCH OF THE ANSWER IS THE MAP WE CHOSE TO DRAW?")
@@ -838,31 +1197,29 @@ def main():
     print(f"\n  the redraw the deck shows: drop the {REDRAW_OUT[0]}-{REDRAW_OUT[1]} road,")
     print(f"  add {' and '.join(a + '-' + b for a, b in REDRAW_IN)} --")
     for m in METRICS:
-        moved = "  <- moved" if REDRAW_CROWNS[m] != ROMA_CROWNS[m] else ""
-        print(f"      {m:13s} {', '.join(REDRAW_CROWNS[m])}{moved}")
+        moved = "  <- moved" if f["REDRAW_CROWNS"][m] != f["ROMA_CROWNS"][m] else ""
+        print(f"      {m:13s} {', '.join(f['REDRAW_CROWNS'][m])}{moved}")
     print("\nall numbers verified")
 
 
-if __name__ == "__main__":
-    main()
-
-
 # =============================================================================
 # 13. Claims the deck's prose makes, checked here so the slide cannot drift
 # =============================================================================
-def _slide_claims():
-    import collections
+@fact("SLIDE_CLAIMS")
+def _slide_claims(ROMA):
     d = dict(nx.single_source_shortest_path_length(ROMA, "Massilia"))
     hist = collections.Counter(v for k, v in d.items() if k != "Massilia")
-    return {
+    claims = {
         # "Three cities one step away, five at two steps, three at three ... sum 22"
         "massilia_hist": (hist[1], hist[2], hist[3]),
         "massilia_sum": sum(v for k, v in d.items() if k != "Massilia"),
         "roma_sum": sum(v for k, v in nx.single_source_shortest_path_length(ROMA, "Roma").items()),
     }
+    assert claims["massilia_hist"] == (3, 5, 3), claims
+    assert claims["massilia_sum"] == 22
+    assert claims["roma_sum"] == 18
+    return claims
 
 
-SLIDE_CLAIMS = _slide_claims()
-assert SLIDE_CLAIMS["massilia_hist"] == (3, 5, 3), SLIDE_CLAIMS
-assert SLIDE_CLAIMS["massilia_sum"] == 22
-assert SLIDE_CLAIMS["roma_sum"] == 18
+if __name__ == "__main__":
+    main()